@@ -0,0 +1,247 @@
+# times the things the program does the most (looking up a date, compiling the whole school year, and
+# reading typed dates) next to how the program used to do them, for developers to see if a change made
+# anything slower (this is not part of the program people download, the updater only ever replaces
+# ABDayDetector.py), the calendar comes from the cache if the program has been opened before
+#   python dev/benchmark.py
+from datetime import datetime, timedelta
+import os
+import sys
+import re
+import time as threadcontrol
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from ABDayDetector import ABDateAssigner, CalendarDays, DateParser, DateType, FindDatesList, Log, UserInterface, printF
+
+# things people have actually typed in (dates, ranges, and a couple of typos)
+PARSER_CORPUS = [
+    "January 1 2024", "Jan 5, 2025", "March 3rd 2025", "03/03/2025", "3-3-25", "May 1st, 2025",
+    "January 1-31 2024", "Jan 17-18, 2024", "January 1 2024 - February 1 2024", "Feb 3 2025 to Feb 14 2025",
+    "12/1/2024 > 12/20/2024", "Dec 20 2024 // Jan 3 2025", "Thursday, March 6 2025", "not a date", "jan 32 2025"
+]
+
+# how dates used to be read from what the user typed: every format in UserInterface.DATE_FORMATS was
+# turned into a regular expression (and compiled) for every input, and every match went through strptime
+# twice
+class LegacyDateParser:
+    def parse(self, user_input):
+        for ordinal in ["st", "nd", "rd", "th"]:
+            user_input = user_input.replace(ordinal, "")
+        return self.try_input(user_input)
+
+    def date(self, string, date_format):
+        return datetime.strptime(string, date_format)
+
+    # searches an input string for a regex pattern
+    def search_regex(self, input_text, pattern):
+        return list(self.search_regex_complex(input_text, pattern).values())
+
+    # returns a dictionary (map) of regex position matches along with what matched
+    # for example:
+    # input = "This is a 123 test"
+    # pattern = "\d{3}" (3 digits in a row)
+    # returned: {11: "123"}
+    # the start index is the start of the string rather than the end
+    def search_regex_complex(self, input_text, pattern):
+        returned = {}
+        for item in re.compile(pattern).finditer(input_text):
+            returned[item.span()[0]] = item.group(0)
+        return returned
+
+    # check if a date can be parsed into a date format
+    def is_date(self, string, date_format):
+        try:
+            self.date(string, date_format)
+            return True
+        except ValueError:
+            return False
+
+    # returns a list of indices of where dates of a certain format are located
+    def find_dates(self, user_input, date_format, day_separators=None):
+        try:
+            returned = []
+            original_format = date_format
+            char_map = UserInterface.DATES_CHARACTER_MAP # for ease of access reasons
+            for character in char_map: # make date format in a regular expression
+                regex = char_map[character][1]
+                if day_separators is not None and "d" in character:
+                    for separator in day_separators:
+                        date_format = date_format.replace(character, regex + separator + regex)
+                date_format = date_format.replace(character, regex)
+
+            dates_raw = self.search_regex(user_input, date_format)
+
+            if len(dates_raw) == 0 and day_separators == None: # old method of Jan 1-31 2024
+                dates_raw = self.find_dates(user_input, original_format, day_separators=[separator for separator in UserInterface.SEPARATORS if separator in user_input])
+
+            if len(dates_raw) == 0:
+                return []
+
+            dates_and_separators = self.search_regex_complex(user_input, UserInterface.REGEX_SEPARATORS + "|" + date_format)
+            next_date, separator, previous_date = None, False, None
+            for index, key in enumerate(dates_and_separators):
+                match = dates_and_separators.get(key)
+                if match not in UserInterface.SEPARATORS:
+                    if next_date is None and self.is_date(match, original_format):
+                        next_date = self.date(match, original_format)
+                    elif previous_date is None and separator == True and self.is_date(match, original_format):
+                        previous_date = self.date(match, original_format)
+                        
+                        delta = (max(previous_date, next_date) - min(previous_date, next_date)).days
+                        
+                        for i in range(0, delta):
+                            dates_raw.append(next_date)
+                            next_date = next_date + timedelta(days=1)
+
+                        next_date, separator, previous_date = None, False, None
+                    continue
+
+                separator = True
+
+
+            dates = []
+            for index, date in enumerate(dates_raw):
+                if day_separators is None:
+                    try:
+                        dates.append(self.date(date, original_format) if type(date) is str else date)
+                    except ValueError as err:
+                        pass
+                    continue
+
+                for separator in day_separators:
+                    located_regex = self.search_regex(user_input, "\d{1,2}" + separator + "\d{1,2}")[0]                
+                    days = [int(i) for i in located_regex.split(separator)]
+
+                date = self.date(user_input.replace(located_regex, "1"), original_format)
+
+                month = date.month
+                year = date.year
+
+                dates = dates + [datetime(year=year, month=month, day=i) for i in range(min(days), max(days) + 1)]
+
+            return dates
+        except Exception as err:
+            return []
+
+    def finalize_and_sort_input(self, final_dates):
+        if len(final_dates) == 1:
+            return final_dates[0]
+
+        final_dates = list(set(final_dates)) # remove duplicates
+
+        dates = {}
+        for date in final_dates:
+            dates[date.toordinal()] = date
+
+        return [dates[key] for key in sorted(dates)]
+
+    def try_input(self, user_input):
+        try:
+         #   for date_format in self.date_formats:
+           #     date = self.try_input(date, inputted, date_format.
+            dates = []
+            for date_format in UserInterface.DATE_FORMATS:
+                found = self.find_dates(user_input, date_format)
+                dates = dates + found
+
+            dates = self.finalize_and_sort_input(dates)
+
+            if isinstance(dates, list):
+                if len(dates) == 0:
+                    raise ValueError("Failed to find dates from input: '" + str(user_input) + "'")
+                if len(dates) == 1:
+                    dates = dates[0]
+
+            return dates
+        except Exception as err:
+            return err if err.__context__ is None else err.__context__
+
+# as epoch (or unix time) in seconds, how dates used to be compared (it looks up the timezone and DST
+# rules of the computer every single time), now they're compared with date.toordinal()
+def as_epoch(date):
+    if date == None:
+        return None
+
+    # month, day, and year DO NOT matter here because we're just getting the time in the end
+    # going with the counties reason as to why 12pm, +- an hour will not matter here for DST reasons
+    time = datetime(year=1, month=1, day=1, hour=12, minute=0, second=0).time()
+    
+    return round(datetime.combine(date, time).timestamp())
+
+# how the program used to find the type of a date, with as_epoch for every comparison
+def legacy_get_date_type(assigner, date):
+    if as_epoch(date) < as_epoch(assigner.year_start) or as_epoch(date) > as_epoch(assigner.year_end):
+        return DateType.OUT_OF_SCOPE
+    elif date.weekday() == 5 or date.weekday() == 6:
+        return DateType.WEEKEND
+    elif date in assigner.days_off.keys():
+        return DateType.DAY_OFF
+    return DateType.SCHOOL_DAY
+
+# how the program used to compile the year, one dictionary per day and as_epoch for the loop
+def legacy_compile(assigner):
+    days = {}
+    school_days = 0
+    current_date = assigner.year_start
+    day_letter = False
+    while as_epoch(current_date) < as_epoch(assigner.year_end + timedelta(days=1)):
+        date_type = legacy_get_date_type(assigner, current_date)
+        days[current_date] = {"type": date_type, "index": {"school": school_days}, "_meta_": None}
+        if date_type == DateType.SCHOOL_DAY:
+            day_letter = not day_letter
+            school_days += 1
+            days[current_date]["_meta_"] = {"day_letter": day_letter}
+        current_date = current_date + timedelta(days=1)
+    return days
+
+# runs the function over and over for about "seconds" seconds, returns how many times it ran per second
+def per_second(function, seconds=0.5):
+    runs = 0
+    started = threadcontrol.perf_counter()
+    elapsed = 0
+    while elapsed < seconds:
+        function()
+        runs += 1
+        elapsed = threadcontrol.perf_counter() - started
+    return runs / elapsed
+
+# returns [name, before (per second), after (per second), unit]
+def run(assigner):
+    # every day of the year plus a month on either side (so OUT_OF_SCOPE gets looked up too)
+    first = assigner.year_start - timedelta(days=30)
+    lookups = [first + timedelta(days=offset) for offset in range((assigner.year_end - first).days + 31)]
+
+    def lookup_before():
+        for day in lookups:
+            legacy_get_date_type(assigner, day)
+
+    def lookup_after():
+        for day in lookups:
+            assigner.get_date_type(day)
+
+    results = []
+    results.append(["date lookups", per_second(lookup_before) * len(lookups), per_second(lookup_after) * len(lookups), "lookups/s"])
+    results.append(["year compiles", per_second(lambda: legacy_compile(assigner)), per_second(lambda: CalendarDays.compile(assigner.year_start, assigner.year_end, assigner.days_off)), "compiles/s"])
+
+    legacy_parser = LegacyDateParser()
+
+    def parse_before():
+        for text in PARSER_CORPUS:
+            legacy_parser.parse(text)
+
+    def parse_after():
+        for text in PARSER_CORPUS:
+            DateParser.merge(DateParser.parse(text))
+
+    results.append(["date parsing", per_second(parse_before) * len(PARSER_CORPUS), per_second(parse_after) * len(PARSER_CORPUS), "inputs/s"])
+    return results
+
+if __name__ == "__main__":
+    Log.silent = True
+    FindDatesList.PREFER_CACHE = True
+    assigner = ABDateAssigner()
+    if assigner.fatal_error is not None:
+        raise assigner.fatal_error
+    printF("&7&oRunning benchmark, this takes a few seconds...")
+    printF("&6BENCHMARK:")
+    for name, before, after, unit in run(assigner):
+        printF(f"&e| &f{name}: &c{round(before):,} &7-> &a{round(after):,} &f{unit} &7(&b{round(after / before, 1)}x&7)")
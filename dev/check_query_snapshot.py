@@ -0,0 +1,60 @@
+# checks that --query never answers from a snapshot (calendar.bin) that was made from a different
+# calendar than the one in the cache (calendar_cache.json), which happens when writing the snapshot
+# fails after the cache was saved, everything is done in a temporary folder without the internet
+#   python dev/check_query_snapshot.py
+from datetime import datetime
+from contextlib import redirect_stdout
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import ABDayDetector
+from ABDayDetector import CalendarDays, CalendarSnapshot, District, FindDatesList, RCPSWebsiteReader, get_cache_path
+
+BEFORE = [
+    'var StartOfYearDate = new Date("August 20, 2024 12:00:00");',
+    'var LastDayOfExams = new Date("June 5, 2025 12:00:00");',
+    'var ListOfDaysOff = [',
+    '    new Date("September 2, 2024 12:00:00"), "Labor Day",',
+    '];'
+]
+AFTER = BEFORE[0:4] + ['    new Date("January 7, 2025 12:00:00"), "Snow Day",'] + BEFORE[4:]
+
+def write_cache(district, content):
+    with open(get_cache_path(district.cache_name(FindDatesList.CACHE_FILE)), "w") as file:
+        file.write(json.dumps({"url": district.url, "fetched": str(datetime.now()), "etag": None, "last_modified": None, "hash": FindDatesList.hash_lines(content), "content": content}))
+
+def write_snapshot(district, content):
+    website = RCPSWebsiteReader(district, content)
+    days = CalendarDays.compile(website.year_start, website.year_end, website.get_days_off())
+    CalendarSnapshot.write(get_cache_path(district.cache_name(CalendarSnapshot.FILE)), days, website.source_hash)
+
+def query(text):
+    sys.argv = [sys.argv[0], "--query", text]
+    output = io.StringIO()
+    with redirect_stdout(output):
+        ABDayDetector.answer_query()
+    return json.loads(output.getvalue())["type"]
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        os.environ["TEMP"] = folder
+        district = District.rcps()
+        ABDayDetector.Log.silent = True
+
+        write_cache(district, BEFORE)
+        write_snapshot(district, BEFORE)
+        before = query("January 7 2025")
+
+        # a snow day made it into the cache, but the snapshot is still the old one
+        write_cache(district, AFTER)
+        after = query("January 7 2025")
+
+    print("same files: " + before + ", cache newer than the snapshot: " + after)
+    if before != "SCHOOL_DAY" or after != "DAY_OFF":
+        print("FAILED, --query answered from a snapshot that doesn't match the cache")
+        sys.exit(1)
+    print("ok")
@@ -0,0 +1,85 @@
+# sends thousands of made-up inputs through UserInterface.handle_input (the same code someone typing
+# goes through) and keeps an eye on how much memory the program is using with tracemalloc, it should
+# stay flat no matter how many dates and commands are asked about (this is not part of the program
+# people download), the calendar comes from the cache if the program has been opened before
+#   python dev/soak.py [inputs]
+from itertools import cycle, islice
+from contextlib import redirect_stdout
+import os
+import sys
+import gc
+import tracemalloc
+import time as threadcontrol
+
+inputs = int(sys.argv[1]) if len(sys.argv) > 1 else None
+sys.argv = sys.argv[0:1] + ["--minimal"] # no welcome message
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from ABDayDetector import ABDateAssigner, Commands, FindDatesList, Log, UserInterface, printF
+
+DEFAULT_INPUTS = 5000
+CHECKS = 5 # how many times memory is measured after warming up
+ALLOWED_GROWTH = 256 * 1024 # bytes, less than this is just noise (a cache filling up, for example)
+SCRIPT = [
+    "January 1 2024", "Jan 5, 2025", "March 3rd 2025", "03/03/2025", "3-3-25", "January 1-31 2024",
+    "January 1 2024 - February 1 2024", "Dec 20 2024 // Jan 3 2025", "not a date", "jan 32 2025",
+    "", "   ", "help", "years", "today", "next", "next B", "previous", "after 5", "schoolday 10", "not a command"
+]
+
+# the soak answers the inputs itself instead of asking for them
+class SoakInterface(UserInterface):
+    def ask_input(self, forced: str=None):
+        pass
+
+# returns (memory after warming up, [memory after each check], peak), all in bytes
+def run(ui, inputs):
+    script = cycle(SCRIPT)
+    per_check = max(1, inputs // CHECKS)
+    # answers go nowhere and long ranges stop at a page so every input costs about the same
+    UserInterface.LIMIT = UserInterface.PAGE_SIZE
+    tracemalloc.start()
+    try:
+        with open(os.devnull, "w") as nowhere, redirect_stdout(nowhere):
+            for inputted in islice(script, per_check): # warm up (caches, the log history)
+                ui.handle_input(inputted)
+            gc.collect()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+            checks = []
+            for check in range(CHECKS):
+                for inputted in islice(script, per_check):
+                    ui.handle_input(inputted)
+                gc.collect()
+                checks.append(tracemalloc.get_traced_memory()[0])
+            peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return baseline, checks, peak
+
+if __name__ == "__main__":
+    inputs = DEFAULT_INPUTS if inputs is None else inputs
+    if inputs < CHECKS:
+        raise ValueError("the soak needs at least " + str(CHECKS) + " inputs")
+
+    Log.silent = True
+    FindDatesList.PREFER_CACHE = True
+    assigner = ABDateAssigner()
+    if assigner.fatal_error is not None:
+        raise assigner.fatal_error
+    ui = SoakInterface(assigner, Commands(), None)
+
+    printF("&7&oAnswering " + "{:,}".format(inputs) + " inputs, this can take a little while...")
+    started = threadcontrol.perf_counter()
+    baseline, checks, peak = run(ui, inputs)
+    elapsed = threadcontrol.perf_counter() - started
+    printF("&6SOAK:")
+    printF(f"&e| &fAfter warming up: &b{baseline / 1024:,.1f} KB")
+    for number, memory in enumerate(checks):
+        printF(f"&e| &fCheck {number + 1}: &b{memory / 1024:,.1f} KB &7({(memory - baseline) / 1024:+,.1f} KB)")
+    printF(f"&e| &fPeak: &b{peak / 1024:,.1f} KB &7({inputs / elapsed:,.0f} inputs/s with tracemalloc on)")
+    growth = max(checks) - baseline
+    if growth < ALLOWED_GROWTH:
+        printF("&e| &aMemory stayed flat.")
+    else:
+        printF(f"&e| &cMemory grew by {growth / 1024:,.1f} KB, something is holding on to old inputs!")
+        sys.exit(1)
@@ -7,6 +7,7 @@ import subprocess
 import importlib
 import traceback
 import json
+import re
 import platform
 import time as threadcontrol
 
@@ -19,33 +20,22 @@ def cmd(command):
 def is_external():
     return False if 'idlelib.run' in sys.modules else True
 
-def color(string, keycode, color):
-    string = string.replace(keycode, color if is_external() ==  True else "")
-    return string
-
+COLORS = {
+    "0": "\u001b[30m", "1": "\u001b[34m", "2": "\u001b[32m", "3": "\u001b[36m",
+    "4": "\u001b[31m", "5": "\u001b[35m", "6": "\u001b[33m", "7": "\u001b[37m",
+    "8": "\u001b[30;1m", "9": "\u001b[34;1m", "a": "\u001b[32;1m", "b": "\u001b[36;1m",
+    "c": "\u001b[31;1m", "d": "\u001b[35;1m", "e": "\u001b[33;1m", "f": "\u001b[37;1m",
+    "l": "\u001b[1m", "n": "\u001b[4m", "h": "\u001b[7m", "r": "\u001b[0m", "o": "\u001b[3m"
+}
+COLOR_PATTERN = re.compile("&([" + "".join(COLORS.keys()) + "])")
+# no colors in IDLE, when the output isn't a terminal, with --no-color, or when NO_COLOR is set
+USE_COLOR = is_external() and "--no-color" not in sys.argv and "NO_COLOR" not in os.environ and sys.stdout.isatty()
+
+# all the codes in one pass instead of one str.replace for each of them
 def color_full(string):
-    string = color(string, "&0", "\u001b[30m")
-    string = color(string, "&1", "\u001b[34m")
-    string = color(string, "&2", "\u001b[32m")
-    string = color(string, "&3", "\u001b[36m")
-    string = color(string, "&4", "\u001b[31m")
-    string = color(string, "&5", "\u001b[35m")
-    string = color(string, "&6", "\u001b[33m")
-    string = color(string, "&7", "\u001b[37m")
-    string = color(string, "&8", "\u001b[30;1m")
-    string = color(string, "&9", "\u001b[34;1m")
-    string = color(string, "&a", "\u001b[32;1m")
-    string = color(string, "&b", "\u001b[36;1m")
-    string = color(string, "&c", "\u001b[31;1m")
-    string = color(string, "&d", "\u001b[35;1m")
-    string = color(string, "&e", "\u001b[33;1m")
-    string = color(string, "&f", "\u001b[37;1m")
-    string = color(string, "&l", "\u001b[1m")
-    string = color(string, "&n", "\u001b[4m")
-    string = color(string, "&h", "\u001b[7m")
-    string = color(string, "&r", "\u001b[0m")
-    string = color(string, "&o", "\u001b[3m")
-    return string
+    if USE_COLOR:
+        return COLOR_PATTERN.sub(lambda match: COLORS[match.group(1)], string)
+    return COLOR_PATTERN.sub("", string)
 
 def printF(string):
     print(color_full(string + "&r"))
@@ -103,10 +93,26 @@ def ask_dependency(name, import_name, desc):
         return
     printF(" ")
 
-def script_install():
+# one session for every download so they share a connection, with timeouts so a stalled server
+# can't freeze the installer and a couple retries for flaky school networks
+TIMEOUT = (5, 30)
+
+def http_session():
     import requests # should be installed now
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry, make_headers
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+    adapter = HTTPAdapter(max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+    return session
+
+def script_install():
+    session = http_session()
     try:
-        download = requests.get("https://update.ab.download.noahf.net/").text
+        download = session.get("https://update.ab.download.noahf.net/", timeout=TIMEOUT).text
         json_data = json.loads(download)
     except Exception as err:
         printF("&8(failed to retrieve list of scripts, ignorantly assuming files and folders: " + str(err) + ")")
@@ -121,7 +127,7 @@ def script_install():
         url = file["download_url"]
         path = str(file["name"])
 
-        download = requests.get(url).text
+        download = session.get(url, timeout=TIMEOUT).text
         with open(path, "w") as file:
             file.write(download)
             if path == "ABDayDetector.py":
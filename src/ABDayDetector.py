@@ -1,7 +1,9 @@
-from tqdm import tqdm
 from datetime import datetime, timedelta, date, time
-from collections import OrderedDict
-import requests
+from collections import OrderedDict, deque
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, compress
+from contextlib import contextmanager
 import traceback
 import os
 import sys
@@ -10,8 +12,17 @@ import json
 import subprocess
 import re
 import platform
+import hashlib
+import struct
+import mmap
+import threading
+import queue
+import atexit
 import time as threadcontrol
 
+# requests and tqdm are imported where they are used instead of up here, they take longer to import
+# than the rest of the program takes to start when answering from the cache (see --query)
+
 def cmd(command):
     # if we're using IDLE to see sys.out, then we probably don't want to execute commands
     # (opening commands in IDLE just opens a cmd.exe window for a few seconds, which is pointless as it
@@ -20,42 +31,235 @@ def cmd(command):
     if UserInterface.is_external():
         os.system(command)
 
+# every file the program caches (calendar, compiled days, etc.) lives in the same folder in %TEMP%
+# (TEMP is not set outside of Windows, so we fall back to whatever python thinks the temp folder is)
+def get_cache_path(file_name):
+    loc = os.getenv("TEMP")
+    if not loc:
+        import tempfile
+        loc = tempfile.gettempdir()
+    path = os.path.join(loc, Constants.CACHE_FOLDER, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
 class Constants:
     DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
     RCPS_WEBSITE = "https://www.rcps.us"
     GITHUB_LINK = "github.com/nfranks8036/ABDayDetectorScript/releases"
+    CACHE_FOLDER = "ABDayDetector"
 
 # Log.text(str) is a replacement of print() when the program is starting so the history
 # can be saved and viewed later via the command "logs"
 # (that is seriously the only reason this exists)
+# the options (--line-log, --minimal, --log-wait, --debug, --log-file) are read once, the first time
+# something is logged, and only the last HISTORY_SIZE lines are kept so a program left open for weeks
+# doesn't keep growing, messages can have "%s" in them that is only filled in if the line is kept:
+#   Log.debug("Inspecting: %s", line) <- costs (almost) nothing unless --debug
 class Log:
-    log_history = []
-    should_wait = None
-    
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+    HISTORY_SIZE = 2000 # lines
+
+    log_history = deque(maxlen=HISTORY_SIZE) # (when, level, message)
+    logged = 0 # every line ever kept, the history only has the last HISTORY_SIZE of them
+    level = INFO
+    configured = False
+    console = True # False with --minimal
+    line_log = False
+    columns = 80 # width of the console for --line-log, measured once
+    should_wait = -1
+    sink = None # LogFile, with --log-file <path>
+    silent = False # nothing gets printed, only saved to the history (one-shot queries print JSON only)
+    # the update check and the website reader log at the same time when starting, this keeps the lines whole
+    # (reentrant because the --log-wait setup logs from inside Log.text)
+    lock = threading.RLock()
+    # threads that work in the background while someone is typing (the calendar watcher) set
+    # Log.background.quiet = True so their lines only go to the history
+    background = threading.local()
+
+    @staticmethod
+    def configure():
+        with Log.lock:
+            if Log.configured:
+                return
+            Log.configured = True
+            Log.console = not (len(sys.argv) > 1 and "--minimal" in sys.argv)
+            Log.line_log = "--line-log" in sys.argv
+            if Log.line_log:
+                try:
+                    Log.columns = os.get_terminal_size()[0]
+                except OSError:
+                    pass # not a console (piped), keep the default
+            if "--debug" in sys.argv:
+                Log.level = Log.DEBUG
+            if "--log-wait" in sys.argv:
+                try:
+                    Log.should_wait = float(sys.argv[sys.argv.index("--log-wait") + 1])
+                    Log.text("Added a " + str(Log.should_wait) + " program-wide hold between each log message.")
+                except Exception as err:
+                    Log.should_wait = -1
+                    Log.text("Failed to add should_wait param from --log-wait: " + str(err))
+            if "--log-file" in sys.argv:
+                try:
+                    Log.sink = LogFile(sys.argv[sys.argv.index("--log-file") + 1])
+                except Exception as err:
+                    Log.text("Failed to open the --log-file: " + str(type(err)) + " " + str(err))
+
+    @staticmethod
+    def debug(message: str, *args):
+        if Log.level <= Log.DEBUG:
+            Log.log(Log.DEBUG, message, args)
+
+    @staticmethod
+    def text(message: str, *args):
+        if Log.level <= Log.INFO:
+            Log.log(Log.INFO, message, args)
+
     @staticmethod
-    def text(string: str):
-        if "--line-log" not in sys.argv and not (len(sys.argv) > 1 and "--minimal" in sys.argv):
+    def warning(message: str, *args):
+        Log.log(Log.WARNING, message, args)
+
+    @staticmethod
+    def error(message: str, *args):
+        Log.log(Log.ERROR, message, args)
+
+    @staticmethod
+    def log(level, message, args):
+        if not Log.configured:
+            Log.configure()
+        if level < Log.level:
+            return
+        string = (message % args) if len(args) > 0 else str(message)
+        with Log.lock:
+            Log._text(level, string)
+
+    @staticmethod
+    def _text(level, string: str):
+        if Log.silent or getattr(Log.background, "quiet", False):
+            pass
+        elif Log.line_log:
+            # --line-log shows progress on one line even with --minimal (restart --refresh uses both)
+            print(string[0:(Log.columns - 5)] + (" " * (Log.columns - len(string))), end="\r")
+        elif Log.console:
             print(string)
 
-        if len(sys.argv) > 1 and "--line-log" in sys.argv:
-            columns = os.get_terminal_size()[0]
-            print(string[0:(columns - 5)] + (" " * (columns - len(string))), end="\r")
-        Log.log_history.append(string)
-        
-        if Log.should_wait == None:
-            try:
-                found = sys.argv.index("--log-wait")
-                Log.should_wait = float(sys.argv[found + 1])
-                Log.text("Added a " + str(Log.should_wait) + " program-wide hold between each log message.")
-            except Exception as err:
-                Log.should_wait = -1
-                Log.text("Failed to add should_wait param from --log-wait: " + str(err))
+        entry = (datetime.now(), level, string)
+        Log.log_history.append(entry)
+        Log.logged += 1
+        if Log.sink is not None:
+            Log.sink.write(entry)
+
         if Log.should_wait >= 0.0:
             threadcontrol.sleep(Log.should_wait)
 
+    # [(number, when, level, message)], the oldest one that's still kept first
     def get_log_history():
-        return Log.log_history
+        with Log.lock:
+            first = Log.logged - len(Log.log_history) + 1
+            return [(first + index,) + entry for index, entry in enumerate(Log.log_history)]
+
+# --log-file <path>
+# every log line also goes to a file, written by a thread of its own so logging never waits on the disk,
+# once the file is bigger than MAX_BYTES it becomes <path>.1 (and <path>.1 becomes <path>.2, etc.)
+class LogFile:
+    MAX_BYTES = 1024 * 1024
+    BACKUPS = 3
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.queue = queue.SimpleQueue()
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.thread = threading.Thread(target=self.run, name="log-file", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, entry):
+        self.queue.put(entry)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=2)
+
+    def run(self):
+        while True:
+            entry = self.queue.get()
+            if entry is None:
+                break
+            when, level, message = entry
+            try:
+                self.file.write(when.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + " " + Log.NAMES.get(level, str(level)).ljust(5) + " " + message + "\n")
+                if self.queue.empty():
+                    self.file.flush()
+                if self.file.tell() > LogFile.MAX_BYTES:
+                    self.rotate()
+            except Exception:
+                pass # nowhere left to log it
+        self.file.close()
+
+    def rotate(self):
+        self.file.close()
+        for number in range(LogFile.BACKUPS - 1, 0, -1):
+            if os.path.exists(self.path + "." + str(number)):
+                os.replace(self.path + "." + str(number), self.path + "." + str(number + 1))
+        os.replace(self.path, self.path + ".1")
+        self.file = open(self.path, "a", encoding="utf-8")
+
+# every request the program sends goes through here so they all share one pool of connections (no new
+# TLS handshake for each request, which is slow on the school's proxy), give up instead of hanging the
+# program forever when a server stops responding, and retry a couple times before giving up
+class Http:
+    CONNECT_TIMEOUT = 5 # seconds to connect to the server
+    READ_TIMEOUT = 15 # seconds to wait in between pieces of data from the server
+    RETRIES = 2
+    RETRY_BACKOFF = 0.5 # waits 0.5s, then 1s, etc. in between retries
+    RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+    session = None
+    lock = threading.Lock()
+
+    @staticmethod
+    def get_session():
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util import Retry, make_headers
+        with Http.lock:
+            if Http.session is None:
+                retry = Retry(
+                    total=Http.RETRIES,
+                    backoff_factor=Http.RETRY_BACKOFF,
+                    status_forcelist=Http.RETRY_STATUSES,
+                    allowed_methods=["GET"],
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # gzip and deflate always, brotli (br) too if the module is installed
+                session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+                Http.session = session
+        return Http.session
+
+    @staticmethod
+    def get(url, headers=None, stream=False):
+        import requests
+        started = threadcontrol.perf_counter()
+        try:
+            response = Http.get_session().get(url, headers=headers, stream=stream, timeout=(Http.CONNECT_TIMEOUT, Http.READ_TIMEOUT))
+        except requests.exceptions.RequestException as err:
+            Log.text("HTTP GET " + str(url) + " failed after " + Http.elapsed(started) + " (" + str(type(err).__name__) + ")")
+            raise err
+        # streamed requests only count until the server starts responding, not the whole download
+        Log.text("HTTP GET " + str(url) + " -> " + str(response.status_code) + " in " + Http.elapsed(started) + (" (" + response.headers.get("Content-Encoding") + ")" if response.headers.get("Content-Encoding") else ""))
+        return response
+
+    @staticmethod
+    def elapsed(started):
+        return str(round((threadcontrol.perf_counter() - started) * 1000)) + "ms"
 
 # Updates the program when it becomes out of date
 class Updater:
@@ -70,54 +274,108 @@ class Updater:
 
     BLOCK_SIZE = 1024
 
+    # separated into numerous strings as to not trip the system itself lol
+    VERSION_MARKER = ("VERSION" + " = " + '"').encode("utf-8")
+    DEV_BUILD_MARKER = ("DEV_BUILD " + "=" + " True").encode("utf-8")
+    LONGEST_VERSION = 32 # a version longer than this after the marker is not a version, it's a mistake
+
+    # looks for the version and dev build markers in a piece of the download, "window" is the new data
+    # with the end of the previous piece in front of it (a marker can be split in between two pieces)
+    # returns what needs to be kept in front of the next piece
+    def check_markers(self, window):
+        # if the version is not what it says it is, then we should not install this version
+        # it is likely that github hasn't updated githubusercontent.com yet for this file, even though
+        # version-history.json is up-to-date
+        # This problem in the way it was described is usually solved within 12 hours or less
+        position = window.find(self.VERSION_MARKER)
+        while position != -1:
+            version_start = position + len(self.VERSION_MARKER)
+            version_end = window.find(b'"', version_start, version_start + self.LONGEST_VERSION)
+            if version_end == -1 and len(window) - version_start < self.LONGEST_VERSION:
+                # the rest of the version is in the next piece, check it again then
+                return window[position:]
+            found_version = window[version_start:version_end].decode("utf-8", "replace") if version_end != -1 else None
+            if found_version != str(self.latest_version):
+                Log.text("Uh oh! Found version " + str(found_version) + " instead of " + str(self.latest_version) + " in the download")
+                raise RuntimeError("Download refused by safety mechanism, found possibly outdated version (GitHub not updating raw.githubusercontent.com?). This may warrant the user to contact Noah at www.noahf.net")
+            position = window.find(self.VERSION_MARKER, version_end)
+
+        if self.DEV_BUILD_MARKER in window:
+            raise RuntimeError("Download refused by safety mechanism, found possible dev build download.\n\n" + ("*" * 60) + "\n IF YOU SEE THIS, PLEASE CONTACT NOAH AT www.noahf.net \n" + ("*" * 60) + "\n\n")
+
+        # just enough to catch a marker that starts at the end of this piece
+        return window[-(max(len(self.VERSION_MARKER), len(self.DEV_BUILD_MARKER)) - 1):]
+
     # download a specified URL
     # the "path" is where the file is going to be saved to in the current working directory (CWD)
-    def download(self, url, path):
-        def name_from_path(path):
-            split_items = path.split("\\")
-            return split_items[len(split_items) - 1]
-        
+    # "file_info" is the file's entry from the download list, if it has a "size" and "sha" (the git blob
+    # hash github gives out), the download is checked against them before it replaces anything
+    def download(self, url, path, file_info=None):
+        from tqdm import tqdm
+        import tempfile
+
         Log.text("-> Downloading '" + str(url) + "'")
         if self.DEV_BUILD == True:
             # do NOT download dev builds, they were likely uploaded by accident
             raise ValueError("Download refused by client, is dev build? " + str(self.DEV_BUILD).upper())
-        request = requests.get(url, stream=True) #stream required for future "tqdm"
-        #file_size = int(request.headers.get('Content-Length', 0))
-        file_size = len(request.content)
-        all_data = []
-        with tqdm( # tqdm for progress bar and data delay
-            desc=name_from_path(path),
-            total=file_size,
-            unit='iB',
-            unit_scale=True,
-            unit_divisor=1024
-        ) as bar:
-            for data in request.iter_content(chunk_size=1024):
-                # if the version is not what it says it is, then we should not install this version
-                # it is likely that github hasn't updated githubusercontent.com yet for this file, even though
-                # version-history.json is up-to-date
-                # This problem in the way it was described is usually solved within 12 hours or less
-                if 'VERSION = \"' in str(data) and not ("VERSION = \"" + str(self.latest_version) + "\"" in str(data)):
-                    Log.text("Uh oh! Cannot find 'VERSION = \"" + str(self.latest_version) + "\"' in data ('" + str(data) + "')")
-                    raise RuntimeError("Download refused by safety mechanism, found possibly outdated version (GitHub not updating raw.githubusercontent.com?). This may warrant the user to contact Noah at www.noahf.net")
-
-                # separated into numerous strings as to not trip the system itself lol
-                if "DEV_BUILD " + "=" + " True" in str(data):
-                    raise RuntimeError("Download refused by safety mechanism, found possible dev build download.\n\n" + ("*" * 60) + "\n IF YOU SEE THIS, PLEASE CONTACT NOAH AT www.noahf.net \n" + ("*" * 60) + "\n\n")
-                all_data.append(data)
-                bar.update(len(data))
-
-        # we download the data first, then place it in a file in case the download fails at any point
-        # we do not want a half-written file because the internet connection stopped midway through download
+        file_info = file_info if isinstance(file_info, dict) else {}
+        expected_size = file_info.get("size")
+        expected_sha = file_info.get("sha")
+
+        request = Http.get(url, stream=True) #stream required for "tqdm"
+        request.raise_for_status()
+        # Content-Length is how many bytes come over the network (compressed, if the server compressed it)
+        file_size = int(request.headers.get('Content-Length', 0))
+
+        # git hashes a file as "blob <size>\0<contents>", so we can only check it if we know the size beforehand
+        git_hash = hashlib.sha1(b"blob " + str(expected_size).encode("utf-8") + b"\0") if expected_sha and expected_size is not None else None
+        sha256 = hashlib.sha256()
+        downloaded = 0
+
+        # we download the data into a temporary file next to the real one, then swap it in once everything
+        # is verified so we never leave a half-written file because the internet connection stopped midway
         # this is how Google Play Store and Apple App Store work with "Downloading" and then "Installing"
-        with open(path, "wb") as file:
-            for datum in all_data:
-                file.write(datum)
-
-        # bar.n is ultimately how much data was downloaded, so we can compare this to what the file size
-        # should be to determine if it all successfully downloaded, += 100 bytes (hence the "file_size / 100")
-        if file_size != 0 and round(bar.n / 100) != round(file_size / 100):
-            raise RuntimeError("Failed to download file from url '" + str(url) + "'")
+        folder = os.path.dirname(os.path.abspath(path))
+        temp = tempfile.NamedTemporaryFile(dir=folder, prefix="." + os.path.basename(path) + ".", suffix=".download", delete=False)
+        try:
+            with temp as file, tqdm( # tqdm for progress bar and data delay
+                desc=os.path.basename(path),
+                total=file_size if file_size > 0 else None,
+                unit='iB',
+                unit_scale=True,
+                unit_divisor=1024
+            ) as bar:
+                carry = b""
+                for data in request.iter_content(chunk_size=self.BLOCK_SIZE * 16):
+                    carry = self.check_markers(carry + data)
+                    file.write(data)
+                    sha256.update(data)
+                    if git_hash is not None:
+                        git_hash.update(data)
+                    downloaded += len(data)
+                    # raw.tell() is how much came over the network, the same thing Content-Length counts
+                    bar.update(request.raw.tell() - bar.n)
+                file.flush()
+                os.fsync(file.fileno())
+                received = request.raw.tell()
+
+            if file_size != 0 and received != file_size:
+                raise RuntimeError("Failed to download file from url '" + str(url) + "' (got " + str(received) + " of " + str(file_size) + " bytes)")
+            if expected_size is not None and downloaded != int(expected_size):
+                raise RuntimeError("Failed to download file from url '" + str(url) + "' (expected " + str(expected_size) + " bytes, got " + str(downloaded) + ")")
+            if git_hash is not None and git_hash.hexdigest() != expected_sha:
+                raise RuntimeError("Failed to download file from url '" + str(url) + "' (hash " + git_hash.hexdigest() + " does not match " + str(expected_sha) + ")")
+            Log.text("Verified " + str(downloaded) + " bytes, sha256 " + sha256.hexdigest() + (" (matches git hash)" if git_hash is not None else ""))
+
+            os.replace(temp.name, path)
+        except BaseException as err:
+            try:
+                os.remove(temp.name)
+            except OSError:
+                pass
+            raise err
+        finally:
+            request.close()
 
         Log.text("<- Downloaded '" + str(url) + "'")
         Log.text(" ")
@@ -130,7 +388,7 @@ class Updater:
         try:
             try:
                 Log.text("Sending request for data to " + str(self.DOWNLOAD_URL) + "...")
-                request = requests.get(self.DOWNLOAD_URL)
+                request = Http.get(self.DOWNLOAD_URL)
                 Log.text("Received response from " + str(request.url) + "!")
                 request = request.text
                 Log.text("Received " + str(len(request.split("\n"))) + " line(s) of data")
@@ -155,7 +413,7 @@ class Updater:
             Log.text(" ")
             file_urls = []
             for file in json_data:
-                self.download(file["download_url"], __file__)
+                self.download(file["download_url"], __file__, file)
         except KeyboardInterrupt as err:
             Log.text("[  ---------       (MANUAL)        ---------  ]")
             Log.text("[  --------- END CHECK FOR UPDATES ---------  ]")
@@ -205,24 +463,35 @@ class Updater:
         Log.text(f"#################### FORCE ERROR APPLIED AT THIS POSITION ({str(position)}) ####################")
         raise Exception(f"Force error activated at position {str(position)}")
     
+    FORCE_LATEST = None
+
+    # the system arguments change things the website reader also looks at (--force-error), so they are
+    # read before anything starts instead of whenever the update check gets around to it
+    @staticmethod
+    def parse_arguments():
+        if len(sys.argv) > 1:
+            Log.text("FOUND SYSTEM ARGUMENTS: " + str(sys.argv))
+            for index, arg in enumerate(sys.argv):
+                if sys.argv[index - 1] == "--version":
+                    Updater.VERSION = arg
+                elif sys.argv[index - 1] == "--latest":
+                    Updater.FORCE_LATEST = arg
+                elif sys.argv[index - 1] == "--dev-build":
+                    Updater.DEV_BUILD = bool(arg)
+                elif sys.argv[index - 1] == "--force-error":
+                    try:
+                        Updater.FORCE_ERROR = int(arg)
+                    except ValueError:
+                        Updater.FORCE_ERROR = None
+    
     def __init__(self):
+        import requests
         Log.text("[  --------- BEGIN CHECK FOR UPDATES ---------  ]")
+        self.offline = False
+        self.latest_version = None # stays None if the check fails
+        self.latest_history = []
         try:
-            self.force_latest = None
-            if len(sys.argv) > 1:
-                Log.text("FOUND SYSTEM ARGUMENTS: " + str(sys.argv))
-                for index, arg in enumerate(sys.argv):
-                    if sys.argv[index - 1] == "--version":
-                        Updater.VERSION = arg
-                    elif sys.argv[index - 1] == "--latest":
-                        self.force_latest = arg
-                    elif sys.argv[index - 1] == "--dev-build":
-                        Updater.DEV_BUILD = bool(arg)
-                    elif sys.argv[index - 1] == "--force-error":
-                        try:
-                            Updater.FORCE_ERROR = int(arg)
-                        except ValueError:
-                            Updater.FORCE_ERROR = None
+            self.force_latest = Updater.FORCE_LATEST
 
             Log.text("Initializing updater...")
             Log.text("Found environment: " + str({
@@ -236,7 +505,7 @@ class Updater:
             # delta_version = -1 means the program can't find how far out-of-date it is (could be a dev build)
             self.delta_version = 0
 
-            check = requests.get(self.CHECK_URL)
+            check = Http.get(self.CHECK_URL)
             check_content = check.text
             Log.text("Found " + str(len(check_content.split("\n"))) + " lines (" + check.url + ")")
 
@@ -268,19 +537,12 @@ class Updater:
                 Log.text(f"Final call: {str(self.delta_version)} versions behind")
 
         except requests.exceptions.ConnectionError as err:
+            # whether the program can go on without internet depends on whether the calendar could be
+            # loaded from the cache, start_concurrently decides that once both are done
+            self.offline = True
+            self.delta_version = -1
             Log.text(traceback.format_exc().strip())
-            Log.text(" ")
-            Log.text(" ")
-            Log.text(" ")
-            Log.text("*************************************************************************")
-            Log.text("**            Failed to retrieve data from the internet.               **")
-            Log.text("**                Are you connected to the internet?                   **")
-            Log.text("** You must be connected to the internet in order to use this program! **")
-            Log.text("**                                                                     **")
-            Log.text("**                     (press enter to exit)                           **")
-            Log.text("*************************************************************************")
-            os.system("pause >NUL")
-            exit()
+            Log.text("Failed to check for updates, no internet connection")
         except Exception as err:
             self.error = err
             self.delta_version = -1
@@ -296,41 +558,231 @@ class Updater:
 
         Log.text("[  --------- END CHECK FOR UPDATES ---------  ]")
 
+# a school district with the same A/B rotation as RCPS, where its calendar is and how to read it
+# RCPS is always there, others can be added in districts.json next to this file (or --districts <file>):
+# [
+#   {"key": "scs", "name": "Salem City Schools", "url": "https://...",
+#    "start_marker": "...", "end_marker": "...",               <- optional, the RCPS ones otherwise
+#    "days_off_variable": "ListOfDaysOff", "year_start_variable": "StartOfYearDate",
+#    "year_end_variable": "LastDayOfExams"}                     <- optional, the RCPS ones otherwise
+# ]
+class District:
+    FILE = "districts.json"
+    DEFAULT_KEY = "rcps"
+
+    def __init__(self, key, name, url,
+                 start_marker="The following four sections must be updated ",
+                 end_marker="Nothing should need to be updated below this line.",
+                 days_off_variable="ListOfDaysOff",
+                 year_start_variable="StartOfYearDate",
+                 year_end_variable="LastDayOfExams"):
+        self.key = str(key).lower()
+        self.name = name
+        self.url = url
+        self.start_marker = start_marker
+        self.end_marker = end_marker
+        self.days_off_variable = days_off_variable
+        self.year_start_variable = year_start_variable
+        self.year_end_variable = year_end_variable
+
+    @staticmethod
+    def rcps():
+        return District(District.DEFAULT_KEY, "Roanoke County Public Schools", Constants.RCPS_WEBSITE)
+
+    # RCPS first, then everything in the districts file (in the order they're written there)
+    @staticmethod
+    def load_all():
+        districts = [District.rcps()]
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), District.FILE)
+        if "--districts" in sys.argv and sys.argv.index("--districts") + 1 < len(sys.argv):
+            path = sys.argv[sys.argv.index("--districts") + 1]
+        if not os.path.exists(path):
+            return districts
+
+        try:
+            with open(path, "r") as file:
+                entries = json.loads(file.read())
+        except Exception as err:
+            Log.text("Failed to read districts from " + path + ": " + str(type(err)) + " " + str(err))
+            return districts
+
+        # one bad entry is skipped, the rest still load
+        for number, data in enumerate(entries, start=1):
+            try:
+                district = District(**data)
+            except Exception as err:
+                Log.text("Skipping district #" + str(number) + " in " + path + ": " + str(type(err)) + " " + str(err))
+                continue
+            if district.key in [known.key for known in districts]:
+                Log.text("Ignoring district '" + district.key + "' from " + path + ", it is already known")
+                continue
+            districts.append(district)
+            Log.text("Found district '" + district.key + "' (" + str(district.name) + ") at " + str(district.url))
+        return districts
+
+    # RCPS keeps the file names it always had, other districts get their key added to them
+    def cache_name(self, file_name):
+        if self.key == District.DEFAULT_KEY:
+            return file_name
+        name, extension = os.path.splitext(file_name)
+        return name + "-" + self.key + extension
+
 class FindDatesList:
-    def __init__(self):
+    # the filtered lines of the RCPS website are saved here along with what the website told us about
+    # its version (ETag/Last-Modified), so the next boot can just ask "has this changed?" instead of
+    # downloading and going through the entire homepage again
+    CACHE_FILE = "calendar_cache.json"
+
+    # True = trust the cache without asking the website if it changed (used by --query, where being
+    # fast matters more than noticing a snow day the second it's announced), but only until it is
+    # MAX_CACHE_AGE old, then the website is asked again (usually a quick "304 Not Modified")
+    PREFER_CACHE = False
+    MAX_CACHE_AGE = timedelta(hours=6) # --max-age <hours>
+
+    def load_cache(self):
+        return FindDatesList.read_cache(self.district)
+
+    @staticmethod
+    def read_cache(district: District):
+        try:
+            with open(get_cache_path(district.cache_name(FindDatesList.CACHE_FILE)), "r") as file:
+                cache = json.loads(file.read())
+            if cache.get("url") != district.url or not isinstance(cache.get("content"), list):
+                Log.text("Found a cached calendar, but it is not for " + district.url + ", ignoring it")
+                return None
+            Log.text("Found cached calendar from " + str(cache.get("fetched")) + " (" + str(len(cache["content"])) + " lines)")
+            return cache
+        except FileNotFoundError:
+            Log.text("No cached calendar found, this must be the first boot")
+        except Exception as err:
+            Log.text("Failed to read the cached calendar, ignoring it: " + str(type(err)) + " " + str(err))
+        return None
+
+    # whether the cache was checked against the website less than MAX_CACHE_AGE ago
+    @staticmethod
+    def is_fresh(cache):
+        try:
+            return datetime.now() - datetime.fromisoformat(str(cache.get("fetched"))) < FindDatesList.MAX_CACHE_AGE
+        except ValueError:
+            return False
+
+    def save_cache(self, response, cache=None):
+        # a "304 Not Modified" keeps what we had (the website might not send the ETag again), only when
+        # it was last checked changes
+        cache = {
+            "url": self.district.url,
+            "fetched": str(datetime.now()),
+            "etag": response.headers.get("ETag") or (cache or {}).get("etag"),
+            "last_modified": response.headers.get("Last-Modified") or (cache or {}).get("last_modified"),
+            "hash": self.content_hash(), # --query checks calendar.bin was made from this (its source_hash)
+            "content": self.content
+        }
+        try:
+            path = get_cache_path(self.district.cache_name(self.CACHE_FILE))
+            with open(path + ".tmp", "w") as file:
+                file.write(json.dumps(cache))
+            os.replace(path + ".tmp", path)
+            Log.text("Saved calendar to the cache at " + path)
+        except Exception as err:
+            # not being able to cache is not the end of the world, we just have to download it next time
+            Log.text("Failed to save the calendar to the cache: " + str(type(err)) + " " + str(err))
+
+    def content_hash(self):
+        return FindDatesList.hash_lines(self.content)
+
+    @staticmethod
+    def hash_lines(content):
+        return hashlib.sha256("\n".join(content).encode("utf-8")).hexdigest()
+
+    def __init__(self, district: District):
         Log.text("[  --------- BEGIN FIND DATES LIST ---------  ]")
 
         Updater.check_force_error(0)
     
-        url = Constants.RCPS_WEBSITE
-        Log.text("RCPS Website: " + url)
-        
-        true_content = requests.get(url).text
-        Log.text("Found " + str(len(true_content.split("\n"))) + " lines on the RCPS website!")
+        self.district = district
+        url = district.url
+        Log.text(district.name + " Website: " + url)
+
+        self.from_cache = False
+        cache = self.load_cache()
+        headers = {}
+        if cache is not None:
+            # conditional request, the website responds with "304 Not Modified" (and no body) if nothing changed
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+
+        if cache is not None and FindDatesList.PREFER_CACHE and FindDatesList.is_fresh(cache):
+            Log.text("Using the cached calendar without checking the RCPS website")
+            self.content = cache["content"]
+            self.from_cache = True
+            Log.text("[  --------- END FIND DATES LIST ---------  ]")
+            return
+
+        import requests
+        try:
+            # streamed so we can stop reading the website as soon as we have what we need
+            response = Http.get(url, headers=headers, stream=True)
+        except requests.exceptions.RequestException as err:
+            if cache is None:
+                raise err
+            # no internet? the cached calendar is better than nothing (and it's probably still correct)
+            Log.text("Failed to contact the RCPS website (" + str(type(err)) + "), using the cached calendar instead")
+            response = None
+
+        if cache is not None and (response is None or response.status_code != 200):
+            self.content = cache["content"]
+            self.from_cache = True
+            if response is not None and response.status_code == 304:
+                Log.text("RCPS website has not changed since " + str(cache.get("fetched")) + ", using the cached calendar")
+                self.save_cache(response, cache)
+            elif response is not None:
+                Log.text("RCPS website responded with " + str(response.status_code) + ", using the cached calendar instead")
+        else:
+            if response.encoding is None:
+                response.encoding = "utf-8"
+            self.content = FindDatesList.filter_lines(response.iter_lines(chunk_size=8192, decode_unicode=True), district)
+            if response.status_code == 200 and len(self.content) > 0:
+                self.save_cache(response)
+
+        if response is not None:
+            # gives the connection back (or drops it if we stopped reading halfway through the website)
+            response.close()
+
+        Updater.check_force_error(2)
 
-        self.content = []
+        Log.text("[  --------- END FIND DATES LIST ---------  ]")
+
+    # only the lines between the two markers are the ones the county updates with their dates
+    # the website is read line by line as it arrives, so everything after the end marker (which is most
+    # of the homepage) is never downloaded and we never hold more than the dates section in memory
+    # (works on anything that gives lines, like a saved copy of the website opened as a file)
+    @staticmethod
+    def filter_lines(lines, district: District):
+        content = []
+        lines_read = 0
         dates_script = False
-        for line in true_content.split("\n"):
+        for line in lines:
             Updater.check_force_error(1)
+            lines_read += 1
             
-            if "The following four sections must be updated " in line:
+            if district.start_marker in line:
                 dates_script = True
                 continue
 
             if not dates_script:
                 continue
 
-            if "Nothing should need to be updated below this line." in line:
+            if district.end_marker in line:
                 dates_script = False
                 break
 
-            self.content.append(line)
-
-        Log.text("Filtered website to " + str(len(self.content)) + " lines!")
+            content.append(line)
 
-        Updater.check_force_error(2)
-
-        Log.text("[  --------- END FIND DATES LIST ---------  ]")
+        Log.text("Read " + str(lines_read) + " lines on the " + district.key.upper() + " website!")
+        Log.text("Filtered website to " + str(len(content)) + " lines!")
+        return content
 
     def get_content(self):
         return self.content
@@ -340,14 +792,23 @@ class RCPSWebsiteReader:
     def date_from_text(self, text):
         return datetime.strptime(text, '%B %d, %Y %H:%M:%S').date()
     
-    def __init__(self):
+    # "content" can be given to read lines from somewhere other than the website (a saved copy of an older year)
+    # (the name is from when RCPS was the only district, it reads any district's website)
+    def __init__(self, district: District, content=None):
         Log.text("----------- BEGIN WEBSITE READER -----------")
         
         Updater.check_force_error(3)
         
         #self.url = "https://www.rcps.us/cms/lib/VA01818713/Centricity/Template/17/setup/aDayBDay_Dates-011624.js?v=011624"
 
-        self.content = FindDatesList().get_content()
+        if content is None:
+            finder = FindDatesList(district)
+            self.content = finder.get_content()
+            self.from_cache = finder.from_cache
+        else:
+            self.content = content
+            self.from_cache = True
+        self.source_hash = FindDatesList.hash_lines(self.content)
             
         Updater.check_force_error(4)
         
@@ -358,35 +819,35 @@ class RCPSWebsiteReader:
         Log.text("** Inspected lines will be cherry-picked via if they match conditions **")
         for line in self.content:
             Updater.check_force_error(5)
-            if "ListOfDaysOff =" in line:
+            if district.days_off_variable + " =" in line:
                 # we are now reading the days off and the program needs to know lmao
                 reading_days_off = True
                 Log.text("---[ Now reading days off and their reason ]---")
                 continue
 
-            if "StartOfYearDate =" in line: #StartOfYearDate =
-                Log.text("Inspecting: " + str(line))
+            if district.year_start_variable + " =" in line: #StartOfYearDate =
+                Log.debug("Inspecting: %s", line)
                 self.year_start = self.date_from_text(line.split('"')[1])
                 Log.text("The year starts " + str(self.year_start))
 
-            if "LastDayOfExams =" in line:
-                Log.text("Inspecting: " + str(line))
+            if district.year_end_variable + " =" in line:
+                Log.debug("Inspecting: %s", line)
                 self.year_end = self.date_from_text(line.split('"')[1])
                 Log.text("The year ends " + str(self.year_end))
 
             if reading_days_off == True:
                 if "]" in line:
                     # arrays in JS end in "]", we know we're done with days off now
-                    Log.text("Inspecting: " + str(line))
+                    Log.debug("Inspecting: %s", line)
                     Log.text("Discovered NO LONGER reading days off, removing var")
                     reading_days_off = False
-                    Log.text("Days off: " + str(self.days_off))
+                    Log.debug("Days off: %s", self.days_off)
                     Log.text("---[ Exiting days off and their reason ]---")
                     continue
 
 
                 line = line.strip()
-                Log.text("Inspecting: " + line)
+                Log.debug("Inspecting: %s", line)
                 elements = line.split('\"')
                 if not len(elements) == 5:
                     Log.text("List element does not split properly, ignoring this element.")
@@ -491,12 +952,539 @@ class DateType:
             return "an exam day"
         return None
 
+# the compiled school year, stored as columns with one slot for every calendar day since year_start
+# (instead of a dictionary of dictionaries for every single day), finding anything about a day is just
+# "how many days after year_start is it" and then reading that slot
+# the calendar index of a day is its slot number, so it doesn't need a column of its own
+class CalendarDays:
+    NO_LETTER = -1
+    NO_REASON = -1
+    COUNTED = ["school_days", "a_days", "b_days", "weekends", "days_off"]
+
+    def __init__(self, year_start: date, year_end: date):
+        self.year_start = year_start
+        self.year_end = year_end
+        self.start_ordinal = year_start.toordinal()
+        self.length = (year_end - year_start).days + 1
+
+        self.types = array("b", [DateType.SCHOOL_DAY]) * self.length # DateType
+        self.letters = array("b", [CalendarDays.NO_LETTER]) * self.length # 1 = A day, 0 = B day
+        self.school_index = array("i", [0]) * self.length # school days before this one
+        self.reason_index = array("h", [CalendarDays.NO_REASON]) * self.length # slot in self.reasons
+        self.reasons = [] # every reason for a day off, only once each ("Winter Break" x 8 -> "Winter Break")
+        # how many of each kind of day come before every slot (one extra slot at the end for the whole year),
+        # so how many of them are between any two days is one subtraction instead of counting every day
+        self.counts = {name: array("i", [0]) * (self.length + 1) for name in CalendarDays.COUNTED}
+        # the slot of every school day in order, the Nth school day is self.school_offsets[N - 1] (and going
+        # the other way is self.school_index, which is how many school days came before a day)
+        self.school_offsets = array("i")
+        # everything the program says about each day, made when the year is added to a CalendarStore
+        self.answers = None # AnswerTable
+        self.breaks = None # BreakIndex, made with the counts
+
+    # goes through every day from the start to the end of the year counting "A" then "B" then "A"
+    # while skipping days off, breaks, and weekends
+    @staticmethod
+    def compile(year_start: date, year_end: date, days_off: dict):
+        days = CalendarDays(year_start, year_end)
+        reason_slots = {}
+        off_ordinals = {}
+        for day, reason in days_off.items():
+            if reason not in reason_slots:
+                reason_slots[reason] = len(days.reasons)
+                days.reasons.append(reason)
+            off_ordinals[day.toordinal()] = reason_slots[reason]
+
+        first_weekday = year_start.weekday()
+        school_days = 0
+        day_letter = False # true = A Day
+        for offset in range(days.length):
+            days.school_index[offset] = school_days
+            if (first_weekday + offset) % 7 >= 5:
+                # weekday == 5 (saturday)
+                # weekday == 6 (sunday)
+                days.types[offset] = DateType.WEEKEND
+            elif days.start_ordinal + offset in off_ordinals:
+                days.types[offset] = DateType.DAY_OFF
+                days.reason_index[offset] = off_ordinals[days.start_ordinal + offset]
+            else:
+                day_letter = not day_letter
+                days.letters[offset] = 1 if day_letter else 0
+                school_days += 1
+
+        days.count_from(0)
+        return days
+
+    # fills in self.counts and self.school_offsets from a slot to the end of the year (everything before
+    # it is still right)
+    def count_from(self, first):
+        del self.school_offsets[self.school_index[first] if first < self.length else len(self.school_offsets):]
+        types, letters = self.types[first:], self.letters[first:]
+        self.school_offsets.extend(compress(range(first, self.length), map(DateType.SCHOOL_DAY.__eq__, types)))
+        counted = {
+            "school_days": map(DateType.SCHOOL_DAY.__eq__, types),
+            "a_days": map((1).__eq__, letters),
+            "b_days": map((0).__eq__, letters),
+            "weekends": map(DateType.WEEKEND.__eq__, types),
+            "days_off": map(DateType.DAY_OFF.__eq__, types)
+        }
+        for name in CalendarDays.COUNTED:
+            self.counts[name][first:] = array("i", accumulate(counted[name], initial=self.counts[name][first]))
+        self.breaks = BreakIndex(self)
+
+    # how many school days are on or before this slot
+    def school_days_through(self, offset):
+        return self.school_index[offset] + (1 if self.types[offset] == DateType.SCHOOL_DAY else 0)
+
+    # how many of each kind of day there are from one slot to another (both included)
+    def count_range(self, start, end):
+        return {name: self.counts[name][end + 1] - self.counts[name][start] for name in CalendarDays.COUNTED}
+
+    # a snow day (or a day off taken back) only changes the days from that day on, so only those are
+    # counted again: "changes" is {offset: reason, or None if it's not a day off anymore}
+    # returns the offsets whose letter changed (including the changed days themselves)
+    def update(self, changes: dict):
+        changes = {offset: reason for offset, reason in changes.items() if 0 <= offset < self.length}
+        if len(changes) == 0:
+            return []
+
+        first_weekday = self.year_start.weekday()
+        for offset, reason in changes.items():
+            if (first_weekday + offset) % 7 >= 5:
+                continue # weekends stay weekends
+            if reason is None:
+                self.types[offset] = DateType.SCHOOL_DAY
+                self.reason_index[offset] = CalendarDays.NO_REASON
+            else:
+                if reason not in self.reasons:
+                    self.reasons.append(reason)
+                self.types[offset] = DateType.DAY_OFF
+                self.reason_index[offset] = self.reasons.index(reason)
+
+        first = min(changes.keys())
+        last = max(changes.keys())
+
+        # the letter of the last school day before the first change is where counting picks back up
+        day_letter = False
+        for offset in range(first - 1, -1, -1):
+            if self.letters[offset] != CalendarDays.NO_LETTER:
+                day_letter = self.letters[offset] == 1
+                break
+        school_days = self.school_index[first]
+
+        changed = []
+        for offset in range(first, self.length):
+            letter = CalendarDays.NO_LETTER
+            if self.types[offset] == DateType.SCHOOL_DAY:
+                letter = 1 if not day_letter else 0
+                if offset > last and self.letters[offset] == letter and self.school_index[offset] == school_days:
+                    # counting lines back up with what was already there, nothing after this changes
+                    break
+                day_letter = not day_letter
+            self.school_index[offset] = school_days
+            if letter != CalendarDays.NO_LETTER:
+                school_days += 1
+            if self.letters[offset] != letter:
+                self.letters[offset] = letter
+                changed.append(offset)
+
+        self.count_from(first)
+        return changed
+
+    def copy(self):
+        days = CalendarDays(self.year_start, self.year_end)
+        days.types = array("b", self.types)
+        days.letters = array("b", self.letters)
+        days.school_index = array("i", self.school_index)
+        days.reason_index = array("h", self.reason_index)
+        days.reasons = list(self.reasons)
+        days.counts = {name: array("i", self.counts[name]) for name in CalendarDays.COUNTED}
+        days.school_offsets = array("i", self.school_offsets)
+        days.breaks = self.breaks # never changed, only replaced
+        return days
+
+    # how many days after year_start the date is, None if it's not in this school year
+    def offset_of(self, date):
+        offset = date.toordinal() - self.start_ordinal
+        if offset < 0 or offset >= self.length:
+            return None
+        return offset
+
+    def date_of(self, offset):
+        return date.fromordinal(self.start_ordinal + offset)
+
+    def get_type(self, offset):
+        return DateType.OUT_OF_SCOPE if offset is None else self.types[offset]
+
+    def get_letter(self, offset):
+        if offset is None or self.letters[offset] == CalendarDays.NO_LETTER:
+            return None
+        return self.letters[offset] == 1
+
+    def get_reason(self, offset):
+        if offset is None or self.reason_index[offset] == CalendarDays.NO_REASON:
+            return None
+        return self.reasons[self.reason_index[offset]]
+
+    def get_summary(self):
+        counts = self.count_range(0, self.length - 1)
+        return {
+            "school_days": {"ALL": counts["school_days"], "A_DAY": counts["a_days"], "B_DAY": counts["b_days"]},
+            "calendar_days": self.length,
+            "days_off": counts["days_off"]
+        }
+
+    # the same layout cached_days.json has always had, for people looking at it
+    def to_json(self):
+        days = {}
+        for offset in range(self.length):
+            date_type = self.types[offset]
+            meta = None
+            if date_type == DateType.SCHOOL_DAY:
+                meta = {
+                    "day_letter_formatted": DayLetter.value_of(self.get_letter(offset)),
+                    "day_letter": self.get_letter(offset)
+                }
+            elif date_type == DateType.DAY_OFF:
+                meta = {"reason": self.get_reason(offset)}
+            days[str(self.date_of(offset))] = {
+                "type": date_type,
+                "index": {"calendar": offset, "school": self.school_index[offset]},
+                "_meta_": meta
+            }
+        days["_meta_"] = self.get_summary()
+        return days
+
+# the days off of a school year as (first day, last day, reason) runs in order, days off for the same
+# reason with only a weekend between them are one run (Dec 23 -> Jan 3: Winter Break), made whenever the
+# year is counted so "what break is this", "when is the next break", and "how long until it" are a bisect
+# instead of going through every day off
+class BreakIndex:
+    def __init__(self, days: CalendarDays):
+        self.runs = []
+        firsts, lasts = [], [] # offsets of every run
+        for offset in compress(range(days.length), map(DateType.DAY_OFF.__eq__, days.types)):
+            if len(lasts) > 0 and days.reason_index[offset] == days.reason_index[lasts[-1]] \
+                and days.counts["weekends"][offset] - days.counts["weekends"][lasts[-1] + 1] == offset - lasts[-1] - 1:
+                lasts[-1] = offset
+                continue
+            firsts.append(offset)
+            lasts.append(offset)
+
+        self.starts = [days.start_ordinal + offset for offset in firsts] # ordinals, for bisect
+        self.ends = [days.start_ordinal + offset for offset in lasts]
+        for first, last in zip(firsts, lasts):
+            self.runs.append((days.date_of(first), days.date_of(last), days.get_reason(first)))
+
+    # how many runs start on or before the day
+    def position(self, day):
+        return bisect_right(self.starts, day.toordinal())
+
+    # the run the day is in, None if it isn't in one
+    def containing(self, day):
+        index = self.position(day) - 1
+        if index >= 0 and self.ends[index] >= day.toordinal():
+            return self.runs[index]
+        return None
+
+    # the first run that starts after the day, None if there are no more this year
+    def next_after(self, day):
+        index = self.position(day)
+        return self.runs[index] if index < len(self.runs) else None
+
+    def days_until_next(self, day):
+        index = self.position(day)
+        return self.starts[index] - day.toordinal() if index < len(self.runs) else None
+
+# everything about a date in one dictionary (for --query and anything else that isn't a human)
+def describe_day(day: date, date_type: int, day_letter, reason, calendar_index, school_index):
+    return {
+        "date": day.isoformat(),
+        "type": DateType.value_of(date_type),
+        "letter": DayLetter.value_of(day_letter),
+        "reason": reason,
+        "calendar_day": calendar_index,
+        "school_day": school_index
+    }
+
+# what the program says about every day of a school year, written out once when the year is added to a
+# CalendarStore (and again when the days off change) instead of every time someone asks about a day:
+# the heading ("MONDAY, MARCH 3RD, 2025"), the answer with and without colors ("&9a B Day" / "a B Day"),
+# and the whole line used when many days are listed
+class AnswerTable:
+    PREFIX = "That day is "
+    OUT_OF_SCOPE = ("&4not in this school year", "not in this school year")
+
+    def __init__(self, days: "CalendarDays"):
+        self.headings = []
+        self.answers = []
+        self.lines = []
+        for offset in range(days.length):
+            day = days.date_of(offset)
+            answer = AnswerTable.answer_for(days.get_type(offset), days.get_letter(offset), days.get_reason(offset))
+            self.headings.append(AnswerTable.heading_for(day))
+            self.answers.append(answer)
+            self.lines.append(AnswerTable.line_for(day, answer))
+
+    # a copy for the same year after CalendarDays.update, only the days at "offsets" are written out again
+    # (the headings never change, so they're shared)
+    def updated(self, days: "CalendarDays", offsets):
+        table = AnswerTable.__new__(AnswerTable)
+        table.headings = self.headings
+        table.answers = list(self.answers)
+        table.lines = list(self.lines)
+        for offset in offsets:
+            answer = AnswerTable.answer_for(days.get_type(offset), days.get_letter(offset), days.get_reason(offset))
+            table.answers[offset] = answer
+            table.lines[offset] = AnswerTable.line_for(days.date_of(offset), answer)
+        return table
+
+    # (colored, plain)
+    @staticmethod
+    def answer_for(date_type, day_letter, reason):
+        if not day_letter == None:
+            return ("&c" if day_letter == DayLetter.A_DAY else "&9") + DayLetter.format(day_letter), DayLetter.format(day_letter)
+        elif not reason == None:
+            return "&e" + reason, reason
+        if date_type == DateType.OUT_OF_SCOPE:
+            return AnswerTable.OUT_OF_SCOPE
+        return "&2" + DateType.format(date_type), DateType.format(date_type)
+
+    @staticmethod
+    def heading_for(day: date, short=False):
+        weekday, month = Constants.DAYS[day.weekday()].upper(), Constants.MONTHS[day.month - 1].upper()
+        if short:
+            weekday, month = weekday[0:3], month[0:3]
+        return "&6&n" + weekday + ", " + month + " " + str(day.day) + ABDateAssigner.get_ordinal_ending(day.day).upper() + ", " + str(day.year)
+
+    @staticmethod
+    def line_for(day: date, answer):
+        return "&r ".join([AnswerTable.heading_for(day, short=True), AnswerTable.PREFIX + "&r" + answer[0], " "])
+
+# the compiled school year saved to a file the way it sits in memory, so a new process can answer
+# "what is March 3rd?" by jumping straight to that day in the file instead of reading the website (or
+# even reading the whole file), the file looks like this:
+#   header: "ABDS", format version, year start, year end, number of days, sha256 of the website lines
+#           the year was compiled from, and where the reasons start
+#   days: one fixed-size record per day since year_start (type, letter, reason slot, school index)
+#   reasons: how many there are, where each one ends, then all of them one after another (utf-8)
+class CalendarSnapshot:
+    FILE = "calendar.bin"
+    MAGIC = b"ABDS"
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct("<4sH2xiiI32sI")
+    RECORD = struct.Struct("<bbhi")
+    COUNT = struct.Struct("<I")
+
+    @staticmethod
+    def write(path, days: CalendarDays, source_hash: str):
+        records = bytearray(CalendarSnapshot.RECORD.size * days.length)
+        for offset in range(days.length):
+            CalendarSnapshot.RECORD.pack_into(records, offset * CalendarSnapshot.RECORD.size, days.types[offset], days.letters[offset], days.reason_index[offset], days.school_index[offset])
+
+        reasons_offset = CalendarSnapshot.HEADER.size + len(records)
+        encoded = [reason.encode("utf-8") for reason in days.reasons]
+        reason_table = bytearray(CalendarSnapshot.COUNT.pack(len(encoded)))
+        position = reasons_offset + CalendarSnapshot.COUNT.size * (len(encoded) + 2)
+        reason_table += CalendarSnapshot.COUNT.pack(position)
+        for reason in encoded:
+            position += len(reason)
+            reason_table += CalendarSnapshot.COUNT.pack(position)
+
+        header = CalendarSnapshot.HEADER.pack(CalendarSnapshot.MAGIC, CalendarSnapshot.FORMAT_VERSION, days.start_ordinal, days.year_end.toordinal(), days.length, bytes.fromhex(source_hash), reasons_offset)
+        with open(path + ".tmp", "wb") as file:
+            file.write(header)
+            file.write(records)
+            file.write(reason_table)
+            file.write(b"".join(encoded))
+        os.replace(path + ".tmp", path)
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.start_ordinal, self.end_ordinal, self.length, source_hash, self.reasons_offset = CalendarSnapshot.HEADER.unpack_from(self.data, 0)
+            if magic != CalendarSnapshot.MAGIC or version != CalendarSnapshot.FORMAT_VERSION:
+                raise ValueError("Not a calendar snapshot (or an older version of one): " + str(path))
+            self.source_hash = source_hash.hex()
+            self.year_start = date.fromordinal(self.start_ordinal)
+            self.year_end = date.fromordinal(self.end_ordinal)
+        except Exception as err:
+            self.close()
+            raise err
+
+    def close(self):
+        self.data.close()
+
+    def get_reason(self, slot):
+        if slot == CalendarDays.NO_REASON:
+            return None
+        start, end = struct.unpack_from("<II", self.data, self.reasons_offset + CalendarSnapshot.COUNT.size * (slot + 1))
+        return self.data[start:end].decode("utf-8")
+
+    # only the bytes of this one day (and its reason) are ever read
+    def describe(self, day: date):
+        offset = day.toordinal() - self.start_ordinal
+        if offset < 0 or offset >= self.length:
+            return describe_day(day, DateType.OUT_OF_SCOPE, None, None, None, None)
+
+        date_type, letter, reason_slot, school_index = CalendarSnapshot.RECORD.unpack_from(self.data, CalendarSnapshot.HEADER.size + offset * CalendarSnapshot.RECORD.size)
+        return describe_day(day, date_type, None if letter == CalendarDays.NO_LETTER else letter == 1, self.get_reason(reason_slot), offset, school_index)
+
+    # the whole year back into memory
+    def to_days(self):
+        days = CalendarDays(self.year_start, self.year_end)
+        for offset in range(self.length):
+            days.types[offset], days.letters[offset], days.reason_index[offset], days.school_index[offset] = CalendarSnapshot.RECORD.unpack_from(self.data, CalendarSnapshot.HEADER.size + offset * CalendarSnapshot.RECORD.size)
+        reason_count = CalendarSnapshot.COUNT.unpack_from(self.data, self.reasons_offset)[0]
+        days.reasons = [self.get_reason(slot) for slot in range(reason_count)]
+        days.count_from(0)
+        return days
+
+# holds the compiled calendars of many school years side by side (sorted by when they start) so a date
+# from any of them can be looked up, not just the year on the RCPS website right now
+# the years come from the snapshots saved every time a year is compiled (%TEMP%/ABDayDetector/years) and
+# from any folder given with --calendars, which can hold snapshots (.bin) or saved copies of the RCPS
+# website from that year (.html, .js, .txt)
+class CalendarStore:
+    FOLDER = "years"
+    SOURCE_EXTENSIONS = [".html", ".htm", ".js", ".txt"]
+
+    def __init__(self):
+        self.calendars = []
+        self.starts = [] # start ordinal of each calendar, same order as self.calendars (for bisect)
+
+    # RCPS years stay where they always were, other districts get a folder inside it
+    @staticmethod
+    def archive_folder(district: District):
+        return CalendarStore.FOLDER if district.key == District.DEFAULT_KEY else os.path.join(CalendarStore.FOLDER, district.key)
+
+    @staticmethod
+    def archive_path(days: CalendarDays, district: District):
+        return get_cache_path(os.path.join(CalendarStore.archive_folder(district), "calendar-" + days.year_start.isoformat() + "-" + days.year_end.isoformat() + ".bin"))
+
+    # every year saved for the district, and the ones in --calendars <folder>
+    def load_archives(self, district: District):
+        self.load_folder(os.path.dirname(get_cache_path(os.path.join(CalendarStore.archive_folder(district), CalendarSnapshot.FILE))), district)
+        if "--calendars" in sys.argv and sys.argv.index("--calendars") + 1 < len(sys.argv):
+            # other districts look in a folder named after them in there
+            folder = sys.argv[sys.argv.index("--calendars") + 1]
+            self.load_folder(folder if district.key == District.DEFAULT_KEY else os.path.join(folder, district.key), district)
+
+    # describe_day for a date in any of the years, None if none of them have it
+    def describe(self, day: date):
+        days = self.find(day)
+        if days is None:
+            return None
+        offset = days.offset_of(day)
+        return describe_day(day, days.get_type(offset), days.get_letter(offset), days.get_reason(offset), offset, days.school_index[offset])
+
+    # a year that starts on the same day as one already here replaces it (the newer one wins)
+    def add(self, days: CalendarDays):
+        if days.answers is None:
+            days.answers = AnswerTable(days)
+        index = bisect_right(self.starts, days.start_ordinal)
+        if index > 0 and self.starts[index - 1] == days.start_ordinal:
+            self.calendars[index - 1] = days
+            return
+        self.starts.insert(index, days.start_ordinal)
+        self.calendars.insert(index, days)
+
+    # the calendar that has this date in it, None if no year we know about does
+    def find(self, day: date):
+        index = bisect_right(self.starts, day.toordinal()) - 1
+        if index < 0:
+            return None
+        days = self.calendars[index]
+        return days if days.offset_of(day) is not None else None
+
+    def load_folder(self, folder, district: District):
+        if not os.path.isdir(folder):
+            return
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            extension = os.path.splitext(name)[1].lower()
+            try:
+                if extension == ".bin":
+                    snapshot = CalendarSnapshot(path)
+                    try:
+                        self.add(snapshot.to_days())
+                    finally:
+                        snapshot.close()
+                elif extension in CalendarStore.SOURCE_EXTENSIONS:
+                    self.add(CalendarStore.compile_source(path, district))
+                else:
+                    continue
+                Log.text("Loaded school year from " + path)
+            except Exception as err:
+                Log.text("Failed to load school year from " + path + ": " + str(type(err)) + " " + str(err))
+
+    # a saved copy of the website (or just the part between the markers)
+    @staticmethod
+    def compile_source(path, district: District):
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            lines = [line.rstrip("\r\n") for line in file]
+        content = FindDatesList.filter_lines(lines, district)
+        if len(content) == 0:
+            content = lines
+        website = RCPSWebsiteReader(district, content)
+        if website.year_start is None or website.year_end is None:
+            raise ValueError("Could not find the start and end of the year")
+        return CalendarDays.compile(website.year_start, website.year_end, website.get_days_off())
+
+    # school days from one date to another (both included), across as many years as it takes
+    def count_school_days(self, from_date: date, to_date: date):
+        return self.count_range(from_date, to_date)["school_days"]
+
+    # the school day "count" school days after a date (or before it, if "count" is negative), even if that's
+    # in another school year, None if none of the school years go that far
+    # (a count of 1 is the next school day, -1 is the last one)
+    def school_day_after(self, day: date, count: int):
+        ordinal = day.toordinal()
+        index = bisect_right(self.starts, ordinal) - 1
+        if count > 0:
+            for days in self.calendars[max(index, 0):]:
+                if ordinal >= days.start_ordinal + days.length:
+                    continue
+                position = days.school_days_through(ordinal - days.start_ordinal) if ordinal >= days.start_ordinal else 0
+                if position + count - 1 < len(days.school_offsets):
+                    return days.date_of(days.school_offsets[position + count - 1])
+                count -= len(days.school_offsets) - position
+        elif count < 0:
+            for days in reversed(self.calendars[:index + 1]):
+                position = days.school_index[ordinal - days.start_ordinal] if ordinal < days.start_ordinal + days.length else len(days.school_offsets)
+                if position + count >= 0:
+                    return days.date_of(days.school_offsets[position + count])
+                count += position
+        return None
+
+    # how many of each kind of day there are from one date to another (both included), across as many
+    # school years as it takes, anything no school year has is "out_of_scope" (summers, mostly)
+    def count_range(self, from_date: date, to_date: date):
+        totals = {name: 0 for name in CalendarDays.COUNTED}
+        covered = 0
+        first = bisect_right(self.starts, from_date.toordinal()) - 1
+        for days in self.calendars[max(first, 0):]:
+            if days.start_ordinal > to_date.toordinal():
+                break
+            start = max(from_date.toordinal(), days.start_ordinal) - days.start_ordinal
+            end = min(to_date.toordinal(), days.start_ordinal + days.length - 1) - days.start_ordinal
+            if start > end:
+                continue
+            for name, count in days.count_range(start, end).items():
+                totals[name] += count
+            covered += end - start + 1
+        totals["calendar_days"] = to_date.toordinal() - from_date.toordinal() + 1
+        totals["out_of_scope"] = totals["calendar_days"] - covered
+        return totals
+
 class ABDateAssigner:
     # ordinal number examples:
     # first (1st), second (2nd), third (3rd)
     # as opposed to cardinal:
     # one (1), two (2), three (3)
-    def get_ordinal_ending(self, cardinal):
+    @staticmethod
+    def get_ordinal_ending(cardinal):
         return "th" if 11 <= cardinal <= 13 else ("th" if cardinal % 10 > 3 else (["th", "st", "nd", "rd", "th"][cardinal % 10]))
 
     # datetime has "date", "datetime", and "time" objects
@@ -507,152 +1495,171 @@ class ABDateAssigner:
             obj = obj.date()
         return obj
     
+    # the compiled calendar this date is in and how far into it, this year first (almost every lookup), then
+    # any other year we know about, DateType.OUT_OF_SCOPE (an offset of None) if none of them have it
+    def calendar_for(self, date):
+        offset = self.days.offset_of(date)
+        if offset is not None:
+            return self.days, offset
+        other = self.store.find(date)
+        if other is not None:
+            return other, other.offset_of(date)
+        return self.days, None
+
     def get_date_type(self, date):
         date = self.normalize(date)
-        
-        value = DateType.SCHOOL_DAY
-        if as_epoch(date) < as_epoch(self.year_start) or as_epoch(date) > as_epoch(self.year_end):
-            # after a certain day in august and before a certain day in may
-            value = DateType.OUT_OF_SCOPE
-        elif date.weekday() == 5 or date.weekday() == 6:
-            # weekday == 5 (saturday)
-            # weekday == 6 (sunday)
-            value = DateType.WEEKEND
-        elif date in self.days_off.keys():
-            value = DateType.DAY_OFF
-        
-        return value
 
-    def get_every_day_information(self):
-        days = {}
-        
-        school_days = {}
-        calendar_days = 0
-        amt_days_off = 0
+        # after a certain day in august and before a certain day in may is DateType.OUT_OF_SCOPE
+        days, offset = self.calendar_for(date)
+        return days.get_type(offset)
 
+    def get_every_day_information(self):
         Updater.check_force_error(7)
         Log.text("|- Compiling date information from year_start...")
-        current_date = self.year_start
-        day_letter = False # true = A Day
-        while as_epoch(current_date) < as_epoch(self.year_end + timedelta(days=1)):
-            date_type = self.get_date_type(current_date)
-            days[current_date] = {
-                    "type": date_type,
-                    "index": {
-                        "calendar": calendar_days,
-                        "school": school_days["ALL"] if "ALL" in school_days.keys() else 0
-                    },
-                    "_meta_": None
-            }
-            
-            if date_type == DateType.SCHOOL_DAY:
-                day_letter = not day_letter
-                if not ("ALL" in school_days.keys()):
-                    school_days["ALL"] = 0
-                if not (DayLetter.value_of(day_letter) in school_days.keys()):
-                    school_days[DayLetter.value_of(day_letter)] = 0
-                
-                school_days["ALL"] += 1
-                school_days[DayLetter.value_of(day_letter)] += 1
-                days[current_date]["_meta_"] = {
-                    "day_letter_formatted": DayLetter.value_of(day_letter),
-                    "day_letter": day_letter
-                }
-            elif date_type == DateType.DAY_OFF:
-                days[current_date]["_meta_"] = {
-                    "reason": self.get_day_off_reason(current_date)
-                }
-                amt_days_off += 1
-
-            calendar_days += 1
-            current_date = current_date + timedelta(days=1)
-
-        days["_meta_"] = {
-            "school_days": school_days,
-            "calendar_days": calendar_days,
-            "days_off": amt_days_off
-        }
-        Log.text("| Found " + str(calendar_days) + " calendary days")
-        
-        def stringify_dates(obj):
-            if isinstance(obj, dict):
-                return {stringify_dates(k): stringify_dates(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [stringify_dates(i) for i in obj]
-            elif isinstance(obj, date):
-                return str(obj)
-            else:
-                return obj
+        days = CalendarDays.compile(self.year_start, self.year_end, self.days_off)
+        Log.text("| Found " + str(days.length) + " calendary days")
         
-        loc = os.getenv("TEMP")
-        ab_day_detector_dir = os.path.join(loc, "ABDayDetector")
-        os.makedirs(ab_day_detector_dir, exist_ok=True)
-        days_file = os.path.join(ab_day_detector_dir, "cached_days.json")
-        Log.text("| Creating cached days at " + days_file)
-        
-        f = open(days_file, "w")
-        Log.text("| Writing (and stringifying) dictionary...")
-        f.write(json.dumps(stringify_dates(days), indent=4))
-        f.close()
-
-        Log.text("|- Wrote File")
+        snapshot_file = get_cache_path(self.district.cache_name(CalendarSnapshot.FILE))
+        if self.is_snapshot_current(snapshot_file) and os.path.exists(CalendarStore.archive_path(days, self.district)):
+            # same calendar as last time, which means the same days as last time
+            Log.text("|- Snapshot at " + snapshot_file + " is already up-to-date")
+            return days
 
+        self.write_snapshot(snapshot_file, days)
         return days
+
+    def write_snapshot(self, snapshot_file, days: CalendarDays):
+        Log.text("| Writing snapshot to " + snapshot_file)
+        try:
+            CalendarSnapshot.write(snapshot_file, days, self.source_hash)
+            # and a copy that stays around after the county moves on to the next year
+            CalendarSnapshot.write(CalendarStore.archive_path(days, self.district), days, self.source_hash)
+            Log.text("|- Wrote File")
+        except Exception as err:
+            # (another process might be reading it right now, it gets written next time)
+            Log.text("|- Failed to write the snapshot: " + str(type(err)) + " " + str(err))
+
+    def is_snapshot_current(self, snapshot_file):
+        try:
+            snapshot = CalendarSnapshot(snapshot_file)
+        except Exception:
+            return False
+        try:
+            return snapshot.source_hash == self.source_hash
+        finally:
+            snapshot.close()
+
+    # the compiled year as it used to be cached (cached_days.json), now only written by the "export" command
+    def export_json(self, path):
+        with open(path, "w") as file:
+            file.write(json.dumps(self.days.to_json(), indent=4))
             
 
     def get_day_letter(self, date):
         date = self.normalize(date)
 
-        if not self.get_date_type(date) == DateType.SCHOOL_DAY:
-            return None
-
         # this is the same as going through every day since the beginning of the year and
         # counting "A" then "B" then "A" while skipping days off, breaks, and weekends accurately
         # (except this is much faster cuz hooman slow, compter fast)
 
-        return self.days[date]["_meta_"]["day_letter"]
+        days, offset = self.calendar_for(date)
+        return days.get_letter(offset)
 
     def get_day_off_reason(self, date):
         date = self.normalize(date)
 
-        if not self.get_date_type(date) == DateType.DAY_OFF:
-            return None
-
-        return self.days_off[date]
+        days, offset = self.calendar_for(date)
+        return days.get_reason(offset)
 
     def get_next_school_day(self, from_date):
-        date = self.normalize(from_date)
-
         # thursday -> friday
         # friday -> monday
         # friday -> tuesday (if we have monday off)
+        return self.store.school_day_after(self.normalize(from_date), 1)
 
-        for index in range(0, 14):
-            date = date + timedelta(days=1)
-            if self.days[date]["type"] == DateType.SCHOOL_DAY:
-                return date
+    def get_previous_school_day(self, from_date):
+        return self.store.school_day_after(self.normalize(from_date), -1)
+
+    # "count" school days after a date (before it if it's negative), for due dates like "5 school days from now"
+    def add_school_days(self, from_date, count: int):
+        if count == 0:
+            raise ValueError("The number of school days can't be 0")
+        return self.store.school_day_after(self.normalize(from_date), count)
 
+    # the date of the Nth school day of the current school year (the first one is 1)
+    def get_nth_school_day(self, number: int):
+        if number < 1 or number > len(self.days.school_offsets):
+            return None
+        return self.days.date_of(self.days.school_offsets[number - 1])
+
+    # the next A day (or B day) after a date, the letters take turns so it's one of the next two school days
+    # (unless a new school year starts in between, which starts over with an A day)
+    def get_next_day_with_letter(self, from_date, day_letter: bool):
+        date = self.get_next_school_day(from_date)
+        for attempt in range(3):
+            if date is None or self.get_day_letter(date) == day_letter:
+                return date
+            date = self.get_next_school_day(date)
         return None
 
+    def describe(self, date):
+        date = self.normalize(date)
+        date_type = self.get_date_type(date)
+        calendar_index, school_index = self.get_progression(date) if date_type != DateType.OUT_OF_SCOPE else (None, None)
+
+        return describe_day(date, date_type, self.get_day_letter(date), self.get_day_off_reason(date), calendar_index, school_index)
+
     def get_progression(self, date):
         date = self.normalize(date)
 
-        indices = self.days[date]["index"]
-        return indices["calendar"], indices["school"]
+        days, offset = self.calendar_for(date)
+        if offset is None:
+            raise KeyError(date)
+        return offset, days.school_index[offset]
+
+    # school days from one date to another (both included), even if they're in different school years
+    def count_school_days(self, from_date, to_date):
+        from_date, to_date = self.normalize(from_date), self.normalize(to_date)
+        if from_date > to_date:
+            from_date, to_date = to_date, from_date
+        return self.store.count_school_days(from_date, to_date)
+
+    # everything about the days from one date to another: how many school/A/B days, weekends, days off and
+    # days outside of any school year there are, and how many school/A/B days are still left (from today)
+    def get_range_summary(self, from_date, to_date, today=None):
+        from_date, to_date = self.normalize(from_date), self.normalize(to_date)
+        if from_date > to_date:
+            from_date, to_date = to_date, from_date
+        today = self.normalize(today) if today is not None else date.today()
+
+        summary = {"from": from_date.isoformat(), "to": to_date.isoformat(), **self.store.count_range(from_date, to_date)}
+        remaining = {name: 0 for name in ["school_days", "a_days", "b_days"]}
+        if today <= to_date:
+            counts = self.store.count_range(max(today, from_date), to_date)
+            remaining = {name: counts[name] for name in remaining}
+        summary["remaining"] = remaining
+        return summary
+
+    def get_school_years(self):
+        return [(days.year_start, days.year_end) for days in self.store.calendars]
 
     def get_total_days(self):
-        return self.days["_meta_"]["calendar_days"], self.days["_meta_"]["school_days"]["ALL"]
+        summary = self.days.get_summary()
+        return summary["calendar_days"], summary["school_days"]["ALL"]
     
-    def __init__(self):
+    def __init__(self, district: District=None):
         self.fatal_error = None
+        self.district = district if district is not None else District.rcps()
         # self.today = datetime.now()
         
         try:
-            website = RCPSWebsiteReader()
+            website = RCPSWebsiteReader(self.district)
+            self.from_cache = website.from_cache
+            self.source_hash = website.source_hash
         except Exception as err:
             self.fatal_error = err
             self.fatal_traceback = err.__traceback__
-            Log.text(f"FATAL ERROR in reading the RCPS website: {str(err)}")
+            Log.text(f"FATAL ERROR in reading the {self.district.key.upper()} website: {str(err)}")
             return
         
         Log.text("* Summary of Found Data *")
@@ -689,52 +1696,222 @@ class ABDateAssigner:
 
         try:
             self.days = self.get_every_day_information()
-            Log.text("Found " + str(len(self.days) - 1) + " calendar days")
+            Log.text("Found " + str(self.days.length) + " calendar days")
         except Exception as err:
             self.fatal_error = err
             self.fatal_traceback = err.__traceback__
             Log.text(f"FATAL ERROR in finding calendar days: {str(err)}")
             return
 
+        # other school years are nice to have, nothing breaks if there aren't any
+        self.store = CalendarStore()
+        self.store.load_archives(self.district)
+        self.store.add(self.days)
+        Log.text("Knows about " + str(len(self.store.calendars)) + " school year(s)")
+
     def get_days_off(self):
         return self.days_off
 
-# as epoch (or unix time) in seconds
-def as_epoch(date: datetime.date):
-    if date == None:
-        return None
+    # the BreakIndex of the school year a date is in (this year if there isn't a date or it's in no year)
+    def get_breaks(self, date=None):
+        if date is None:
+            return self.days.breaks
+        days, offset = self.calendar_for(self.normalize(date))
+        return days.breaks
+
+    # days off were added ({date: reason}) or taken back ([date, ...]) after the year was compiled,
+    # only the days after the earliest change are counted again instead of the whole year
+    # returns every date whose letter changed
+    # (the changes are made to a copy that is swapped in at the end, so a lookup from another thread
+    # sees the old year or the new one, never half of each)
+    def apply_days_off_delta(self, added: dict, removed):
+        days_off = dict(self.days_off)
+        changes = {}
+        for day in removed:
+            day = self.normalize(day)
+            if day in days_off:
+                del days_off[day]
+                changes[day.toordinal() - self.days.start_ordinal] = None
+        for day, reason in added.items():
+            day = self.normalize(day)
+            days_off[day] = reason
+            changes[day.toordinal() - self.days.start_ordinal] = reason
+
+        days = self.days.copy()
+        changed_offsets = days.update(changes)
+        changed = [days.date_of(offset) for offset in changed_offsets]
+        if self.days.answers is not None:
+            # a day off for a new reason keeps its (lack of a) letter, so the changed days themselves too
+            days.answers = self.days.answers.updated(days, set(changed_offsets) | set(offset for offset in changes if 0 <= offset < days.length))
+        self.days_off = dict(sorted(days_off.items()))
+        self.store.add(days)
+        self.days = days
+        Log.text("Applied " + str(len(added)) + " new and " + str(len(removed)) + " removed day(s) off, " + str(len(changed)) + " day(s) changed letter")
+        return changed
+
+    # the website changed while the program was open, the new days off are applied as a delta (or the
+    # whole year is compiled again if the county moved on to the next school year), returns what changed
+    def refresh(self, website: "RCPSWebsiteReader"):
+        year_start, year_end = website.get_year_start(), website.get_year_end()
+        days_off = website.get_days_off()
+        if year_start == None or year_end == None:
+            raise Exception("Either year start or year end is absent.")
+
+        added = {day: reason for day, reason in days_off.items() if self.days_off.get(day) != reason}
+        removed = [day for day in self.days_off if day not in days_off]
+        diff = {
+            "district": self.district.key,
+            "days_off_added": {day.isoformat(): reason for day, reason in sorted(added.items())},
+            "days_off_removed": [day.isoformat() for day in sorted(removed)],
+            "letters_changed": [],
+            "new_year": year_start != self.year_start or year_end != self.year_end
+        }
 
-    # month, day, and year DO NOT matter here because we're just getting the time in the end
-    # going with the counties reason as to why 12pm, +- an hour will not matter here for DST reasons
-    time = datetime(year=1, month=1, day=1, hour=12, minute=0, second=0).time()
-    
-    return round(datetime.combine(date, time).timestamp())
+        if diff["new_year"]:
+            days = CalendarDays.compile(year_start, year_end, days_off)
+            self.store.add(days)
+            self.days, self.days_off = days, days_off
+            self.year_start, self.year_end = year_start, year_end
+        else:
+            diff["letters_changed"] = [day.isoformat() for day in self.apply_days_off_delta(added, removed)]
+
+        self.source_hash = website.source_hash
+        self.write_snapshot(get_cache_path(self.district.cache_name(CalendarSnapshot.FILE)), self.days)
+        return diff
+
+# --watch [minutes]
+# keeps checking the calendar in the background while the program is open (a conditional request, so
+# most of the time it's a "304 Not Modified" and nothing else) and puts in the new one as soon as the
+# county changes it, everyone listening is told what changed:
+#   {"district": "rcps", "days_off_added": {"2025-01-07": "Snow Day"}, "days_off_removed": [],
+#    "letters_changed": ["2025-01-07", "2025-01-08", ...], "new_year": false}
+class CalendarWatcher:
+    DEFAULT_MINUTES = 10
+    HISTORY = 50 # changes kept for /changes
+
+    def __init__(self, assigners: dict, minutes: float):
+        self.assigners = assigners
+        self.minutes = minutes
+        self.listeners = []
+        self.history = []
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="calendar-watcher", daemon=True)
+
+    # how often --watch asked for (in minutes), None if it wasn't there
+    @staticmethod
+    def requested_minutes():
+        if "--watch" not in sys.argv:
+            return None
+        index = sys.argv.index("--watch")
+        try:
+            return max(0.1, float(sys.argv[index + 1]))
+        except (IndexError, ValueError):
+            return CalendarWatcher.DEFAULT_MINUTES
+
+    def start(self):
+        Log.text("Watching " + str(len(self.assigners)) + " calendar(s) for changes every " + str(self.minutes) + " minute(s)")
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        Log.background.quiet = True
+        while not self.stopped.wait(self.minutes * 60):
+            for key, assigner in list(self.assigners.items()):
+                try:
+                    diff = self.check(assigner)
+                except Exception as err:
+                    Log.text("Failed to check the " + key + " calendar for changes: " + str(type(err)) + " " + str(err))
+                    continue
+                if diff is None:
+                    continue
+                self.history = (self.history + [diff])[-CalendarWatcher.HISTORY:]
+                for listener in self.listeners:
+                    try:
+                        listener(diff)
+                    except Exception as err:
+                        Log.text("Failed to tell a listener about the " + key + " calendar changing: " + str(err))
+
+    # None if nothing changed
+    def check(self, assigner: ABDateAssigner):
+        if assigner.fatal_error is not None:
+            return None
+        content = FindDatesList(assigner.district).get_content()
+        if FindDatesList.hash_lines(content) == assigner.source_hash:
+            # not modified, or modified somewhere that isn't the dates
+            return None
+        Log.text("The " + assigner.district.key + " calendar changed, reading it again")
+        return assigner.refresh(RCPSWebsiteReader(assigner.district, content))
 
 def get_last_day_of_month(day):
     next_month = day.replace(day=28) + timedelta(days=4)
     return next_month - timedelta(days=next_month.day)
 
-# commands are the alternate to writing a date in the command line
+# every command name and alias letter by letter, so "vers" finds "version" without looking at every
+# command (and so TAB can finish typing a command)
+class PrefixTrie:
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, word, value):
+        node = self.root
+        for letter in word:
+            node = node.setdefault(letter, {})
+        node[None] = value # None marks the end of a word
+
+    # {word: value} for every word that starts with prefix
+    def find(self, prefix):
+        node = self.root
+        for letter in prefix:
+            node = node.get(letter)
+            if node is None:
+                return {}
+        found = {}
+        remaining = [(prefix, node)]
+        while len(remaining) > 0:
+            word, node = remaining.pop()
+            for letter, child in node.items():
+                if letter is None:
+                    found[word] = child
+                else:
+                    remaining.append((word + letter, child))
+        return found
+
+# commands are the alternate to writing a date in the command line
 # they execute arbitrary code with certain argumetns
 class Commands:
+    PLUGIN_FOLDER = "plugins"
+    SHORTEST_ABBREVIATION = 2 # "ve" is enough for version, "v" has to be an alias
+
     def register(self, data: dict, function, require=None):
         # structure:
         # {[
         #   "command_name": {
         #       "data": {
         #           "name": "command_name",
-        #           "aliases": ["alias1", "alias2"]
+        #           "aliases": ["alias1", "alias2"],
+        #           "buffered": True <- optional, everything it prints is written at once when it's done
+        #           "exact": True <- optional, has to be typed in full (anything that closes, changes, or writes something)
         #       },
-        #       "func": <internal function>
+        #       "func": <internal function>, None for a plugin that hasn't been loaded yet
+        #       "path": <plugin file> <- only for plugins
         #   }
         # ]}
         
-        self.commands[data["name"]] = {
+        command = {
             "data": data,
             "func": function,
             "reqs": require,
             }
-        Log.text("Registered command: " + str(data))
+        self.commands[data["name"]] = command
+        # the first command to claim a name or alias keeps it
+        for word in [data["name"]] + data["aliases"]:
+            if self.index.setdefault(word.lower(), command) is command:
+                self.trie.insert(word.lower(), data["name"])
+        Log.debug("Registered command: %s", data)
+        return command
 
     def conditional_register(self, assigner):
         if assigner.fatal_error is not None:
@@ -758,27 +1935,115 @@ class Commands:
         inputted_args = inputted.split(" ")
         inputted_args.pop(0)
 
-        command = None
-        for key in self.commands:
-            command_info = self.commands[key]
-            if inputted_command == key.lower(): # check if they executed command name
-                command = command_info
-                break
-            if inputted_command in command_info["data"]["aliases"]: # check if they executed alias
-                command = command_info
-                break
+        command = self.index.get(inputted_command)
+        if command is None and not Commands.looks_like_date(inputted_command):
+            command = self.abbreviation(inputted_command)
         
         try:
             if command is not None and command["reqs"] is not None and command["reqs"](ui) == False:
                 raise Exception("This command failed a required condition, no other information was specified.")
                 
-            return command["func"](ui, inputted_args) if command is not None else False
+            if command is None:
+                return False
+            function = self.function_of(command)
+            if command["data"].get("buffered") == True:
+                # long outputs that don't ask for anything, written all at once
+                with Renderer.buffered():
+                    return function(ui, inputted_args)
+            return function(ui, inputted_args)
         except Exception as err:
             printF(f"&cFailed to execute {str(inputted_command)}, try again later!")
             printF(f"&8&o{str(err)} &c&oof type &8&o{str(type(err))}")
             printF(" ")
             return True
         
+    # dates (2025-03-03, March 3, Thursday, March 6) go straight to the date parser once they aren't a command
+    @staticmethod
+    def looks_like_date(word):
+        word = word.rstrip(",.")
+        return word[0:1].isdigit() or word in DateParser.MONTHS or word.capitalize() in Constants.DAYS
+
+    # the command a unique start of a name or alias belongs to ("vers" -> version), None if there isn't one
+    # (commands marked "exact" are never abbreviated, "up" shouldn't upgrade and "st" shouldn't close the program)
+    def abbreviation(self, word):
+        if len(word) < Commands.SHORTEST_ABBREVIATION:
+            return None
+        names = set(name for name in self.trie.find(word).values() if self.commands[name]["data"].get("exact") != True)
+        return self.commands[names.pop()] if len(names) == 1 else None
+
+    # for readline (TAB), the state-th name or alias that starts with what was typed so far
+    def complete(self, text, state):
+        if state == 0:
+            self.completions = sorted(self.trie.find(text.lower()))
+        return self.completions[state] if state < len(self.completions) else None
+
+    # plugins are only read the first time they're used, so they cost nothing when the program starts
+    def function_of(self, command):
+        if command["func"] is None:
+            import importlib.util
+            name = command["data"]["name"]
+            Log.text("Loading plugin command '" + name + "' from " + command["path"])
+            spec = importlib.util.spec_from_file_location("plugin_" + name, command["path"])
+            module = importlib.util.module_from_spec(spec)
+            module.printF = printF
+            module.Log = Log
+            spec.loader.exec_module(module)
+            command["func"] = module.run
+        return command["func"]
+
+    # plugins/<name>.py next to the program (or --plugins <folder>), the file name is the command and the
+    # comments at the very top are read without running the file:
+    #   # Shows what's for lunch (lunch [date])   <- shown in help
+    #   # aliases: menu, food
+    #   def run(ui, args):                       <- printF and Log are already there
+    #       printF("&e| &fPizza!")
+    #       return True
+    def register_plugins(self):
+        folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), Commands.PLUGIN_FOLDER)
+        if "--plugins" in sys.argv and sys.argv.index("--plugins") + 1 < len(sys.argv):
+            folder = sys.argv[sys.argv.index("--plugins") + 1]
+        if not os.path.isdir(folder):
+            return
+
+        for file_name in sorted(os.listdir(folder)):
+            name, extension = os.path.splitext(file_name)
+            if extension != ".py" or name.startswith("_"):
+                continue
+            if name.lower() in self.index:
+                Log.text("Ignoring plugin " + file_name + ", '" + name.lower() + "' is already a command")
+                continue
+            path = os.path.join(folder, file_name)
+            # nobody knows what a plugin does until it runs, so it has to be typed in full
+            data = {"name": name.lower(), "aliases": [], "desc": "Plugin from " + file_name + ".", "exact": True}
+            try:
+                with open(path, "r") as file:
+                    for line in file:
+                        if not line.startswith("#"):
+                            break
+                        line = line[1:].strip()
+                        if line.lower().startswith("aliases:"):
+                            data["aliases"] = [alias.strip().lower() for alias in line[len("aliases:"):].split(",") if alias.strip() != ""]
+                        elif line != "" and data["desc"].startswith("Plugin from "):
+                            data["desc"] = line
+            except Exception as err:
+                Log.text("Failed to read plugin " + path + ": " + str(type(err)) + " " + str(err))
+                continue
+            self.register(data, None, self.req_no_fatal_errors)["path"] = path
+
+    # whether a command can be used right now, the same answer until the program switches districts
+    def is_enabled(self, ui, command):
+        key = (command["data"]["name"], ui.assigner.district.key, ui.assigner.fatal_error is None)
+        enabled = self.enabled.get(key)
+        if enabled is None:
+            enabled = True
+            try:
+                if command["reqs"] is not None and command["reqs"](ui) == False:
+                    raise Exception()
+            except Exception:
+                enabled = False
+            self.enabled[key] = enabled
+        return enabled
+
     def req_no_fatal_errors(self, ui):
         if ui.assigner.fatal_error is None:
             return True
@@ -793,17 +2058,23 @@ class Commands:
     # version of java reflections, this is easier for now
     def __init__(self):
         self.commands = {}
+        self.index = {} # every name and alias -> its command
+        self.trie = PrefixTrie()
+        self.enabled = {} # (name, district, no fatal error) -> whether help shows it as usable
+        self.completions = []
 
         self.register(
             {"name": "help",
              "aliases": ["?", "/help", "dateformats", "dateformat", "commands", "command", "cmd", "cmds", "formats", "format", "dates", "date"],
-             "desc": "Displays this help menu"},
+             "desc": "Displays this help menu",
+             "buffered": True},
             self.help
         )
         self.register(
             {"name": "logs",
              "aliases": ["showlogs", "log"],
-             "desc": "Shows any log messages that occurred when the program started."},
+             "desc": "Shows any log messages that occurred when the program started.",
+             "buffered": True},
             self.logs
         )
         self.register(
@@ -815,19 +2086,22 @@ class Commands:
         self.register(
             {"name": "upgrade",
              "aliases": ["update", "improve", "updates", "upgrades"],
-             "desc": "Upgrades the program to the latest version if applicable."},
+             "desc": "Upgrades the program to the latest version if applicable.",
+             "exact": True},
             self.upgrade
         )
         self.register(
             {"name": "restart",
              "aliases": ["rs", "reboot", "rb"],
-             "desc": "Closes and re-opens the program; performs a restart."},
+             "desc": "Closes and re-opens the program; performs a restart.",
+             "exact": True},
             self.restart
         )
         self.register(
             {"name": "exit",
              "aliases": ["stop", "end"],
-             "desc": "Closes the program window."},
+             "desc": "Closes the program window.",
+             "exact": True},
             self.exit
         )
         self.register(
@@ -838,14 +2112,81 @@ class Commands:
             
             self.req_no_fatal_errors
         )
+        self.register(
+            {"name": "next",
+             "aliases": ["nextday", "nextschoolday"],
+             "desc": "Shows the next school day, or the next A/B day (next [A/B] [date])."},
+            self.next_school_day,
+
+            self.req_no_fatal_errors
+        )
+        self.register(
+            {"name": "previous",
+             "aliases": ["prev", "lastschoolday"],
+             "desc": "Shows the last school day before today or a date (previous [date])."},
+            self.previous_school_day,
+
+            self.req_no_fatal_errors
+        )
+        self.register(
+            {"name": "after",
+             "aliases": ["due", "schooldaysafter"],
+             "desc": "Shows the date a number of school days after today or a date (after <number> [date], negative goes back)."},
+            self.school_days_after,
+
+            self.req_no_fatal_errors
+        )
+        self.register(
+            {"name": "schoolday",
+             "aliases": ["nth", "nthschoolday"],
+             "desc": "Shows the date of a school day of this year by its number (schoolday <number>)."},
+            self.nth_school_day,
+
+            self.req_no_fatal_errors
+        )
         self.register(
             {"name": "showdays",
              "aliases": ["days", "day", "showdaysoff", "daysoff", "show_days_off", "showbreak", "showbreaks", "breaks", "break"],
-             "desc": "Shows all days off and breaks, how many days are left for school, and how many days has it been."},
+             "desc": "Shows all days off and breaks, how many days are left for school, and how many days has it been.",
+             "buffered": True},
             self.show_days,
             
             self.req_no_fatal_errors
         )
+        self.register(
+            {"name": "nextbreak",
+             "aliases": ["untilbreak", "whenbreak"],
+             "desc": "Shows the next day off or break and how long until it (nextbreak [date])."},
+            self.next_break,
+
+            self.req_no_fatal_errors
+        )
+        self.register(
+            {"name": "years",
+             "aliases": ["schoolyears", "calendars"],
+             "desc": "Shows every school year the program knows about (dates in any of them can be entered).",
+             "buffered": True},
+            self.years,
+
+            self.req_no_fatal_errors
+        )
+        self.register(
+            {"name": "district",
+             "aliases": ["districts", "school", "schools"],
+             "desc": "Shows the school districts the program read, or switches to another one (district [name]).",
+             "buffered": True,
+             "exact": True},
+            self.district
+        )
+        self.register(
+            {"name": "export",
+             "aliases": ["exportdays", "dump"],
+             "desc": "Saves every day of the school year to a JSON file for debugging (export [path]).",
+             "exact": True},
+            self.export,
+
+            self.req_no_fatal_errors
+        )
         self.register(
             {"name": "share",
              "aliases": [],
@@ -858,18 +2199,14 @@ class Commands:
              "desc": "Shows you the contact information for Noah F. Use this if you need any help or find any issues."},
             self.contact
         )
+        self.register_plugins()
 
     def help(self, ui, args):
         printF(" ")
         printF("&6AVAILABLE COMMANDS:")
         for key in self.commands:
             command = self.commands[key]
-            enabled = True
-            try:
-                if command["reqs"] is not None and command["reqs"](ui) == False:
-                    raise Exception()
-            except Exception as err:
-                enabled = False
+            enabled = self.is_enabled(ui, command)
             printF(("&b" if enabled == True else "&c") + str(command["data"]["name"]) + "&f: " + str(command["data"]["desc"]))
         printF(" ")
         if ui.assigner.fatal_error is None:
@@ -1042,8 +2379,116 @@ class Commands:
     def logs(self, ui, args):
         printF(" ")
         printF("&6LOG HISTORY:")
-        for index, line in enumerate(Log.get_log_history()):
-            printF(f"&c[&e{str(index + 1)}&c] &7" + str(line))
+        for number, when, level, line in Log.get_log_history():
+            printF(f"&c[&e{str(number)}&c] " + ("&7" if level == Log.INFO else ("&8" if level == Log.DEBUG else "&c" + Log.NAMES[level] + " &7")) + str(line))
+        if Log.logged > len(Log.log_history):
+            printF("&7&o(only the last " + str(Log.HISTORY_SIZE) + " lines are kept, start with &b&o--log-file <path>&7&o to keep all of them)")
+        printF(" ")
+        return True
+
+    def years(self, ui, args):
+        printF(" ")
+        printF("&6SCHOOL YEARS:")
+        for year_start, year_end in ui.assigner.get_school_years():
+            current = year_start == ui.assigner.year_start
+            printF("&e| " + ("&a" if current else "&b") + year_start.strftime("%b " + ui.number_of(year_start) + " %Y") + " &7-> " + ("&a" if current else "&b") + year_end.strftime("%b " + ui.number_of(year_end) + " %Y") + ("&7 (current)" if current else "") + " &f: " + str(ui.assigner.count_school_days(year_start, year_end)) + " school days")
+        printF("&7&oAdd older years by restarting with &b&o--calendars <folder>&7&o (snapshots or saved copies of the website)")
+        printF(" ")
+        return True
+
+    # the date at the end of a command (next March 3 2025), today if there isn't one
+    def date_argument(self, args):
+        return parse_query_date(" ".join(args)) if len(args) > 0 else date.today()
+
+    def print_school_day(self, ui, prefix, day):
+        if day is None:
+            printF("&c" + prefix + " is not in any school year the program knows about.")
+            return
+        printF("&e| &f" + prefix + " is &b" + day.strftime("%A, %B " + ui.number_of(day)) + ui.assigner.get_ordinal_ending(day.day) + day.strftime(", %Y") + " &f(" + ui.provide_information(day, prefix="") + "&f)")
+
+    def next_school_day(self, ui, args):
+        printF(" ")
+        try:
+            letter = None
+            if len(args) > 0 and args[0].lower() in ["a", "b"]:
+                letter = DayLetter.A_DAY if args.pop(0).lower() == "a" else DayLetter.B_DAY
+            from_date = self.date_argument(args)
+            if letter is None:
+                self.print_school_day(ui, "The next school day", ui.assigner.get_next_school_day(from_date))
+            else:
+                self.print_school_day(ui, "The next " + ("A" if letter == DayLetter.A_DAY else "B") + " day", ui.assigner.get_next_day_with_letter(from_date, letter))
+        except Exception as err:
+            printF("&cAn error occurred, possible invalid date? &8" + str(err))
+        printF(" ")
+        return True
+
+    def previous_school_day(self, ui, args):
+        printF(" ")
+        try:
+            self.print_school_day(ui, "The last school day", ui.assigner.get_previous_school_day(self.date_argument(args)))
+        except Exception as err:
+            printF("&cAn error occurred, possible invalid date? &8" + str(err))
+        printF(" ")
+        return True
+
+    def school_days_after(self, ui, args):
+        printF(" ")
+        try:
+            if len(args) == 0:
+                raise ValueError("how many school days? (after <number> [date])")
+            count = int(args.pop(0))
+            from_date = self.date_argument(args)
+            self.print_school_day(ui, str(abs(count)) + " school day(s) " + ("after " if count > 0 else "before ") + from_date.strftime("%b " + ui.number_of(from_date) + " %Y"), ui.assigner.add_school_days(from_date, count))
+        except Exception as err:
+            printF("&cAn error occurred, possible invalid number or date? &8" + str(err))
+        printF(" ")
+        return True
+
+    def nth_school_day(self, ui, args):
+        printF(" ")
+        try:
+            number = int(args[0]) if len(args) > 0 else None
+            if number is None:
+                raise ValueError("which school day? (schoolday <number>)")
+            day = ui.assigner.get_nth_school_day(number)
+            if day is None:
+                printF("&cThis school year only has &b" + str(len(ui.assigner.days.school_offsets)) + "&c school days.")
+            else:
+                self.print_school_day(ui, "School day #" + str(number), day)
+        except Exception as err:
+            printF("&cAn error occurred, possible invalid number? &8" + str(err))
+        printF(" ")
+        return True
+
+    def district(self, ui, args):
+        printF(" ")
+        if len(args) > 0:
+            key = " ".join(args).lower()
+            if key not in ui.assigners:
+                printF("&cThere is no district called &b" + key + "&c, try one of &b" + "&c, &b".join(ui.assigners.keys()))
+                printF(" ")
+                return True
+            ui.assigner = ui.assigners[key]
+            printF("&aNow using &b" + ui.assigner.district.name + "&a, dates you type are for them now.")
+            if ui.assigner.fatal_error is not None:
+                printF("&cIts calendar failed to load: &8" + str(ui.assigner.fatal_error))
+            printF(" ")
+            return True
+
+        printF("&6SCHOOL DISTRICTS:")
+        for key, assigner in ui.assigners.items():
+            current = assigner is ui.assigner
+            status = "&7(calendar failed to load)" if assigner.fatal_error is not None else "&f" + assigner.year_start.strftime("%Y") + "-" + assigner.year_end.strftime("%Y")
+            printF("&e| " + ("&a" if current else "&b") + key + " &f: " + str(assigner.district.name) + " " + status + (" &7(current)" if current else ""))
+        printF("&7&oSwitch with &b&odistrict <name>&7&o, add more in &b&o" + District.FILE + "&7&o next to this program")
+        printF(" ")
+        return True
+
+    def export(self, ui, args):
+        path = " ".join(args) if len(args) > 0 else get_cache_path("cached_days.json")
+        ui.assigner.export_json(path)
+        printF(" ")
+        printF("&aExported " + str(ui.assigner.days.length) + " days to &b" + os.path.abspath(path))
         printF(" ")
         return True
 
@@ -1057,92 +2502,82 @@ class Commands:
         return True
 
     def show_days(self, ui, args):
-        days_off = {}
-        last_index = 0
-        last_day = None
-        for index, key in enumerate(ui.assigner.get_days_off()):
-            # Feb 12 2024: Parent-Teacher Conf
-            # Dec 16 2023 - Jan 2 2024:
-            reason = ui.assigner.get_days_off()[key]
-            is_multiple_days = last_day != None and as_epoch(key) - as_epoch(last_day) == 86400 and days_off[last_index]["reason"] == reason
-            if is_multiple_days == True:
-                days_off[last_index] = {
-                    "from": days_off[last_index]["from"],
-                    "to": key,
-                    "reason": days_off[last_index]["reason"]
-                }
-                last_day = key
-                continue
-            last_index += 1
-            if is_multiple_days == False:
-                days_off[last_index] = {
-                    "from": key,
-                    "to": key,
-                    "reason": reason
-                }
-            last_day = key
-
-            
+        breaks = ui.assigner.get_breaks()
         now = datetime.now()
-        now_epoch = as_epoch(now)
-        printed = False
+        now_ordinal = now.toordinal()
 
         def colorify(date):
-            epoch = as_epoch(date)
-            if epoch == now_epoch:
+            ordinal = date.toordinal()
+            if ordinal == now_ordinal:
                 return "&r&a"
-            if epoch > now_epoch:
+            if ordinal > now_ordinal:
                 return "&r&3"
             return "&r&c"
 
         def print_now():
             printF("&7&o" + now.strftime("%b " + ui.number_of(now) + " %Y") + ": " + ui.provide_information(now, prefix="", colored=False))
         
-        printF(" ")
-        printF(f"&6DAYS OFF: &7({str(len(days_off.keys()))})")
-        for key in days_off.keys():
-            from_date = days_off[key]["from"]
-            to_date = days_off[key]["to"]
-            reason = days_off[key]["reason"]
-            
-            try:
-                if as_epoch(from_date) >= now_epoch and as_epoch(to_date) <= now_epoch:
-                    printed = True
-
-                date_before = as_epoch(days_off[key - 1]["from"]) if as_epoch(now) < as_epoch(ui.assigner.year_start) else as_epoch(ui.assigner.year_start)
-                if printed == False and date_before < now_epoch and as_epoch(from_date) > now_epoch:
-                    print_now()
-                    printed = True
-
-                prefix = colorify(from_date) + from_date.strftime("%b " + ui.number_of(from_date) + " %Y")
-                if from_date != to_date:
-                    prefix = prefix + " &7-> " + colorify(to_date) + to_date.strftime("%b " + ui.number_of(to_date) + " %Y")
-                prefix = prefix + "&f: "
-                
-                printF(prefix + "&e" + reason)
-            except Exception as err:
-                try:
-                    printF("&r&3" + from_date.strftime("%b " + ui.number_of(from_date) + " %Y") + " &7-> &r&3" + to_date.strftime("%b " + ui.number_of(to_date) + " %Y") + "&f: &e" + reason)
-                except Exception as err2:
-                    printF("&cAn error occurred: &8" + str(err2) + " caused by " + str(err))
+        # today goes between the breaks before and after it (right after the break, if it's in one)
+        now_position = breaks.position(now)
 
-        if printed == False:
+        printF(" ")
+        printF(f"&6DAYS OFF: &7({str(len(breaks.runs))})")
+        for index, (from_date, to_date, reason) in enumerate(breaks.runs):
+            if index == now_position:
+                print_now()
+            prefix = colorify(from_date) + from_date.strftime("%b " + ui.number_of(from_date) + " %Y")
+            if from_date != to_date:
+                prefix = prefix + " &7-> " + colorify(to_date) + to_date.strftime("%b " + ui.number_of(to_date) + " %Y")
+            printF(prefix + "&f: &e" + str(reason))
+        if now_position == len(breaks.runs):
             print_now()
 
         cd_total, sd_total = ui.assigner.get_total_days()
-        cd_experienced, sd_experienced = ui.assigner.get_progression(now)
+        # before the year starts none of it has happened yet, after it ends all of it has
+        if now_ordinal < ui.assigner.year_start.toordinal():
+            cd_experienced, sd_experienced = 0, 0
+        elif now_ordinal > ui.assigner.year_end.toordinal():
+            cd_experienced, sd_experienced = cd_total, sd_total
+        else:
+            cd_experienced, sd_experienced = ui.assigner.get_progression(now)
         cd_left, sd_left = cd_total - cd_experienced, sd_total - sd_experienced
         cd_percent, sd_percent = (cd_experienced / cd_total) * 100, (sd_experienced / sd_total) * 100
 
         cd_percent, sd_percent = round(cd_percent), round(sd_percent)
-
-        current_a_day_index, current_b_day_index = 0, 0
         
         printF(" ")
         printF(f"&fSchool Days: &b{str(sd_experienced)}&7/&e{str(sd_total)} &f(&d{str(sd_percent)}%&f) (&a{str(sd_left)} &fleft)")
         printF(f"&fCalendar Days: &b{str(cd_experienced)}&7/&e{str(cd_total)} &f(&d{str(cd_percent)}%&f) (&a{str(cd_left)} &fleft)")
         printF(" ")
         return True
+
+    def next_break(self, ui, args):
+        day = self.date_argument(args)
+        breaks = ui.assigner.get_breaks(day)
+        name = "Today" if len(args) == 0 else day.strftime("%b " + ui.number_of(day) + " %Y")
+
+        def span(run):
+            first, last, reason = run
+            text = "&e" + str(reason) + " &7(&b" + first.strftime("%b " + ui.number_of(first) + " %Y")
+            if first != last:
+                text = text + " &7-> &b" + last.strftime("%b " + ui.number_of(last) + " %Y")
+            return text + "&7)"
+
+        printF(" ")
+        printF("&6NEXT BREAK:")
+        current = breaks.containing(day)
+        if current is not None:
+            printF("&e| &f" + name + " is during " + span(current))
+        upcoming = breaks.next_after(day)
+        if upcoming is None:
+            printF("&e| &fThere are no more breaks in that school year.")
+        else:
+            until = breaks.days_until_next(day)
+            # the school days in between, not counting the day asked about
+            school_days = ui.assigner.count_school_days(day + timedelta(days=1), upcoming[0] - timedelta(days=1)) if until > 1 else 0
+            printF("&e| &f" + span(upcoming) + " &fstarts in &a" + str(until) + " &fday" + ("" if until == 1 else "s") + " &7(&a" + str(school_days) + " &7school day" + ("" if school_days == 1 else "s") + " before it)")
+        printF(" ")
+        return True
         
     def inspect(self, ui, args):
         printF(" ")
@@ -1161,6 +2596,217 @@ class Commands:
 # the user interface
 # the MOTD and instructions
 # the command input
+# reads dates out of whatever the user typed in one go: the text is split into tokens once (by one regular
+# expression compiled when the program starts) and the tokens are read left to right, no strptime and no
+# trying every format one after another
+# everything in UserInterface.DATE_FORMATS works (with or without ordinals like 3rd), and also:
+#   2025-03-03
+#   January 1 2024 - February 1 2024     (any of UserInterface.SEPARATORS, every day in between)
+#   January 1-31 2024                    (days of one month)
+#   Jan 6 2025 Jan 8 2025                (more than one date)
+# returns (first, last) pairs of dates, a single date is (date, date)
+class DateParser:
+    MONTHS = {
+        **{name.lower(): number + 1 for number, name in enumerate(Constants.MONTHS)},
+        **{name.lower()[0:3]: number + 1 for number, name in enumerate(Constants.MONTHS)},
+        "sept": 9
+    }
+    DAYS_IN_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    TOKENS = re.compile(
+        r"(?P<iso>(?P<iso_year>\d{4})-(?P<iso_month>\d{1,2})-(?P<iso_day>\d{1,2}))(?!\d)"
+        r"|(?P<numeric>(?P<month>\d{1,2})(?P<between>[-/])(?P<day>\d{1,2})(?P=between)(?P<year>\d{4}|\d{2}))(?!\d)"
+        r"|(?P<number>\d+)(?:st|nd|rd|th)?(?![A-Za-z\d])"
+        r"|(?P<word>[A-Za-z]+)"
+        r"|(?P<separator>//|[-/>|])"
+        r"|(?P<comma>,)"
+        r"|(?P<other>\S)",
+        re.IGNORECASE)
+
+    # ("date", (year, month, day)), ("number", (value, digits)), ("word", "january"), ("separator", "-"), ...
+    @staticmethod
+    def tokenize(text):
+        tokens = []
+        for match in DateParser.TOKENS.finditer(text):
+            kind = match.lastgroup if match.lastgroup in ["number", "word", "separator", "comma", "other"] else None
+            if match.group("iso") is not None:
+                tokens.append(("date", (int(match.group("iso_year")), int(match.group("iso_month")), int(match.group("iso_day")))))
+            elif match.group("numeric") is not None:
+                year = int(match.group("year"))
+                if len(match.group("year")) == 2:
+                    year += 2000 if year < 69 else 1900 # the same as strptime's %y
+                tokens.append(("date", (year, int(match.group("month")), int(match.group("day")))))
+            elif kind == "number":
+                tokens.append(("number", (int(match.group("number")), len(match.group("number")))))
+            elif kind == "word":
+                word = match.group("word").lower()
+                tokens.append(("separator", word) if word in UserInterface.SEPARATORS else ("word", word))
+            else:
+                tokens.append((kind, match.group(0)))
+        return tokens
+
+    # None if there is no such day (February 30th)
+    @staticmethod
+    def make(year, month, day):
+        if month < 1 or month > 12 or day < 1 or year < 1:
+            return None
+        leap = month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        if day > DateParser.DAYS_IN_MONTH[month - 1] + (1 if leap else 0):
+            return None
+        return date(year, month, day)
+
+    # a date (or days of a month) starting at tokens[index], returns ((first, last), index after it) or
+    # (None, index) if there isn't one there
+    @staticmethod
+    def read(tokens, index):
+        kind, value = tokens[index]
+        if kind == "date":
+            day = DateParser.make(*value)
+            return ((day, day) if day is not None else None), index + 1
+        if kind != "word" or value not in DateParser.MONTHS:
+            return None, index
+
+        # MONTH DAY [SEPARATOR DAY] [,] YEAR
+        month = DateParser.MONTHS[value]
+        position = index + 1
+        if position >= len(tokens) or tokens[position][0] != "number":
+            return None, index
+        first_day = last_day = tokens[position][1][0]
+        position += 1
+        if position + 1 < len(tokens) and tokens[position][0] == "separator" and tokens[position + 1][0] == "number" and tokens[position + 1][1][1] <= 2:
+            last_day = tokens[position + 1][1][0]
+            position += 2
+        if position < len(tokens) and tokens[position][0] == "comma":
+            position += 1
+        if position >= len(tokens) or tokens[position][0] != "number" or tokens[position][1][1] != 4:
+            return None, index
+
+        year = tokens[position][1][0]
+        first, last = DateParser.make(year, month, min(first_day, last_day)), DateParser.make(year, month, max(first_day, last_day))
+        if first is None or last is None:
+            return None, index
+        return (first, last), position + 1
+
+    @staticmethod
+    def parse(text):
+        tokens = DateParser.tokenize(text)
+        found = []
+        index = 0
+        while index < len(tokens):
+            days, after = DateParser.read(tokens, index)
+            if days is None:
+                index += 1
+                continue
+            # DATE SEPARATOR DATE
+            if days[0] == days[1] and after + 1 < len(tokens) and tokens[after][0] == "separator":
+                other, after_other = DateParser.read(tokens, after + 1)
+                if other is not None and other[0] == other[1]:
+                    days = (min(days[0], other[0]), max(days[0], other[0]))
+                    after = after_other
+            found.append(days)
+            index = after
+        return found
+
+    # sorts the (first, last) pairs and joins the ones that overlap or touch, so every date is in exactly
+    # one of them and they're in order (the dates in them are never made until something asks for them)
+    @staticmethod
+    def merge(found):
+        merged = []
+        for first, last in sorted(found):
+            if len(merged) > 0 and first.toordinal() <= merged[-1][1].toordinal() + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+        return merged
+
+    @staticmethod
+    def count(merged):
+        return sum(last.toordinal() - first.toordinal() + 1 for first, last in merged)
+
+    # every date in the merged pairs in order, one at a time (January 1 2024 - December 31 2030 is never
+    # a list of 2,557 dates)
+    @staticmethod
+    def iterate(merged):
+        for first, last in merged:
+            for ordinal in range(first.toordinal(), last.toordinal() + 1):
+                yield date.fromordinal(ordinal)
+
+# everything printF prints goes through here
+# the color codes are found in one pass with a regular expression compiled when the program starts (instead
+# of looking for all 21 codes one after another), lines that were already turned into terminal colors
+# are remembered, and with Renderer.buffered() every line is held until the end and written all at once
+# (the logs or a month of days are one write instead of hundreds)
+class Renderer:
+    # yes these are minecraft: java edition color codes
+    # no I refuse to give them up, I know them like the back of my hand
+    CODES = {
+        "0": "\u001b[30m", "1": "\u001b[34m", "2": "\u001b[32m", "3": "\u001b[36m",
+        "4": "\u001b[31m", "5": "\u001b[35m", "6": "\u001b[33m", "7": "\u001b[37m",
+        "8": "\u001b[30;1m", "9": "\u001b[34;1m", "a": "\u001b[32;1m", "b": "\u001b[36;1m",
+        "c": "\u001b[31;1m", "d": "\u001b[35;1m", "e": "\u001b[33;1m", "f": "\u001b[37;1m",
+        "l": "\u001b[1m", "n": "\u001b[4m", "h": "\u001b[7m", "r": "\u001b[0m", "o": "\u001b[3m"
+    }
+    PATTERN = re.compile("&([" + "".join(CODES.keys()) + "])")
+    CACHE_SIZE = 4096 # lines
+    COLOR = None # decided the first time something is printed, see Renderer.use_color()
+
+    cache = {}
+    pending = threading.local() # lines held by Renderer.buffered() (each thread has its own)
+
+    # no colors in IDLE, when printing into a file or another program (python ABDayDetector.py > days.txt),
+    # with --no-color, or when NO_COLOR is set (https://no-color.org)
+    @staticmethod
+    def use_color():
+        if Renderer.COLOR is None:
+            Renderer.COLOR = UserInterface.is_external() and "--no-color" not in sys.argv and "NO_COLOR" not in os.environ and sys.stdout.isatty()
+        return Renderer.COLOR
+
+    @staticmethod
+    def render(string):
+        rendered = Renderer.cache.get(string)
+        if rendered is None:
+            if Renderer.use_color():
+                rendered = Renderer.PATTERN.sub(lambda match: Renderer.CODES[match.group(1)], string)
+            else:
+                rendered = Renderer.PATTERN.sub("", string)
+            if len(Renderer.cache) >= Renderer.CACHE_SIZE:
+                Renderer.cache.clear()
+            Renderer.cache[string] = rendered
+        return rendered
+
+    @staticmethod
+    def line(string):
+        lines = getattr(Renderer.pending, "lines", None)
+        if lines is not None:
+            lines.append(Renderer.render(string))
+            return
+        sys.stdout.write(Renderer.render(string) + "\n")
+
+    # writes out what buffered() is holding so far (before asking for input, for example)
+    @staticmethod
+    def flush():
+        lines = getattr(Renderer.pending, "lines", None)
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+        sys.stdout.flush()
+
+    # with Renderer.buffered():
+    #     printF(...) x 500 <- written once at the end
+    @staticmethod
+    @contextmanager
+    def buffered():
+        if getattr(Renderer.pending, "lines", None) is not None:
+            yield # already inside one
+            return
+        Renderer.pending.lines = []
+        try:
+            yield
+        finally:
+            try:
+                Renderer.flush()
+            finally:
+                Renderer.pending.lines = None
+
 class UserInterface:
     # separators are how exactly you can specify multiple dates
     # for example:
@@ -1168,6 +2814,12 @@ class UserInterface:
     # January 1 2024 - Februrary 1 2024 will be just as valid as January 1 2024 > February 1 2024
     SEPARATORS = ["-", "/", "//", ">", "to", "|"]
     REGEX_SEPARATORS = "|".join(SEPARATORS)
+    # ranges longer than this get a summary (how many A days, B days, etc.) before the days themselves
+    LONGEST_LISTED_RANGE = 14
+    # how many days are listed before asking if you want to see more (only asked at a terminal)
+    PAGE_SIZE = 20
+    # --limit <days>, the most days listed for one input (no asking for more)
+    LIMIT = None
 
     DATE_FORMATS = [
             "%B %d %Y",
@@ -1193,45 +2845,42 @@ class UserInterface:
         # detects if the user is running in IDLE or not (used for color support and whatnot)
         return False if 'idlelib.run' in sys.modules else True
 
-    def color(string, keycode, color):
-        string = string.replace(keycode, color if UserInterface.is_external() ==  True else "")
-        return string
-
     def color_full(string):
-        # yes these are minecraft: java edition color codes
-        # no I refuse to give them up, I know them like the back of my hand
-        string = UserInterface.color(string, "&0", "\u001b[30m")
-        string = UserInterface.color(string, "&1", "\u001b[34m")
-        string = UserInterface.color(string, "&2", "\u001b[32m")
-        string = UserInterface.color(string, "&3", "\u001b[36m")
-        string = UserInterface.color(string, "&4", "\u001b[31m")
-        string = UserInterface.color(string, "&5", "\u001b[35m")
-        string = UserInterface.color(string, "&6", "\u001b[33m")
-        string = UserInterface.color(string, "&7", "\u001b[37m")
-        string = UserInterface.color(string, "&8", "\u001b[30;1m")
-        string = UserInterface.color(string, "&9", "\u001b[34;1m")
-        string = UserInterface.color(string, "&a", "\u001b[32;1m")
-        string = UserInterface.color(string, "&b", "\u001b[36;1m")
-        string = UserInterface.color(string, "&c", "\u001b[31;1m")
-        string = UserInterface.color(string, "&d", "\u001b[35;1m")
-        string = UserInterface.color(string, "&e", "\u001b[33;1m")
-        string = UserInterface.color(string, "&f", "\u001b[37;1m")
-        string = UserInterface.color(string, "&l", "\u001b[1m")
-        string = UserInterface.color(string, "&n", "\u001b[4m")
-        string = UserInterface.color(string, "&h", "\u001b[7m")
-        string = UserInterface.color(string, "&r", "\u001b[0m")
-        string = UserInterface.color(string, "&o", "\u001b[3m")
-        return string
+        return Renderer.render(string)
 
     global printF
     def printF(string):
         # &r at the end because otherwise it will carry over into the next line (no flush?)
-        print(UserInterface.color_full(string + "&r"))
+        Renderer.line(string + "&r")
     
-    def __init__(self, ab_date_assigner: ABDateAssigner, commands: Commands, updater: Updater):
+    # told by the CalendarWatcher (--watch) whenever a calendar changes while the program is open
+    def calendar_changed(diff):
+        printF(" ")
+        printF("&6&lCALENDAR CHANGED &7(" + diff["district"] + ")")
+        if diff["new_year"]:
+            printF("&e| &fThe calendar is for a new school year now.")
+        for day, reason in diff["days_off_added"].items():
+            printF("&e| &aNew day off: &b" + day + " &f(" + str(reason) + ")")
+        for day in diff["days_off_removed"]:
+            printF("&e| &cNot a day off anymore: &b" + day)
+        if len(diff["letters_changed"]) > 0:
+            printF("&e| &f" + str(len(diff["letters_changed"])) + " day(s) switched A/B, starting &b" + diff["letters_changed"][0])
+        printF(" ")
+        print(UserInterface.color_full("&fEnter date or command: &b"), end="", flush=True)
+
+    def __init__(self, ab_date_assigner: ABDateAssigner, commands: Commands, updater: Updater, assigners: dict=None, watcher: "CalendarWatcher"=None):
         self.assigner = ab_date_assigner
+        self.watcher = watcher
+        if "--limit" in sys.argv:
+            try:
+                UserInterface.LIMIT = max(1, int(sys.argv[sys.argv.index("--limit") + 1]))
+            except (IndexError, ValueError):
+                Log.text("Ignoring --limit, it needs a number of days after it")
+        # every district that was read, by key (the "district" command switches between them)
+        self.assigners = assigners if assigners is not None else {ab_date_assigner.district.key: ab_date_assigner}
         self.commands = commands.conditional_register(self.assigner)
         self.updater = updater
+        self.enable_completion()
 
         now = datetime.now()
 
@@ -1241,60 +2890,78 @@ class UserInterface:
         Log.text(" ")
         Log.text(" ")
 
-        if not (len(sys.argv) > 1 and "--minimal" in sys.argv):
-            cmd("cls")
-            printF("&6SCHOOL DAY DETECTOR &8v" + Updater.VERSION + (" &r&c&l&n(DEVELOPER BUILD)" if Updater.DEV_BUILD == True else ""))
-            printF("&e| &fWelcome to the the school day detector.")
-            printF(" ")
-            printF("&6WHAT?")
-            printF("&e| &fThis program lets you figure out if a day is going to be an A day or a B day.")
-            printF("&e| &fNOTE: The program will update its A/B day calculator with unexpected days off (e.g., snow) if they occur.")
-            printF(" ")
-            if self.assigner.fatal_error is None:
-                printF("&6HOW?")
-                printF("&e| &fEnter a date below and the program will give you any and all information about it.")
-                printF("&e| &fType &bhelp &fto view all the commands you can utilize and available date formats.")
-                printF("&e| &fType &bcontact &fif you need to contact Noah if you find any bugs or issues.")
-                printF("&e|  ")
-                printF("&e|   &r&6A SINGLE DATE:")
-                printF("&e|   &r&5| &fThe format should be: &aMONTH DAY YEAR")
-                printF("&e|   &r&5| &fFor example: &r&3" + now.strftime("%B " + self.number_of(now) + " %Y"))
-                printF("&e|  ")
-                printF("&e|   &r&6MULTIPLE DATES:")
-                printF("&e|   &r&5| &fThe format should be: &aMONTH DAY YEAR - MONTH DAY YEAR")
-                printF("&e|   &r&5| &fFor example: &r&3" + now.strftime("%B") + " 1 " + now.strftime("%Y") + " - " + now.strftime("%B") + " " + str(get_last_day_of_month(now).day) + " " + now.strftime("%Y"))
+        # the welcome message is written in one go
+        with Renderer.buffered():
+            if not (len(sys.argv) > 1 and "--minimal" in sys.argv):
+                cmd("cls")
+                printF("&6SCHOOL DAY DETECTOR &8v" + Updater.VERSION + (" &r&c&l&n(DEVELOPER BUILD)" if Updater.DEV_BUILD == True else ""))
+                printF("&e| &fWelcome to the the school day detector.")
+                printF(" ")
+                printF("&6WHAT?")
+                printF("&e| &fThis program lets you figure out if a day is going to be an A day or a B day.")
+                if self.watcher is not None:
+                    printF("&e| &fNOTE: The program checks for unexpected days off (e.g., snow) every " + str(self.watcher.minutes) + " minute(s) while it's open.")
+                else:
+                    printF("&e| &fNOTE: The program will update its A/B day calculator with unexpected days off (e.g., snow) if they occur &7(when restarted, or start it with &b--watch&7)&f.")
+                printF(" ")
+                if self.assigner.fatal_error is None:
+                    printF("&6HOW?")
+                    printF("&e| &fEnter a date below and the program will give you any and all information about it.")
+                    printF("&e| &fType &bhelp &fto view all the commands you can utilize and available date formats.")
+                    printF("&e| &fType &bcontact &fif you need to contact Noah if you find any bugs or issues.")
+                    printF("&e|  ")
+                    printF("&e|   &r&6A SINGLE DATE:")
+                    printF("&e|   &r&5| &fThe format should be: &aMONTH DAY YEAR")
+                    printF("&e|   &r&5| &fFor example: &r&3" + now.strftime("%B " + self.number_of(now) + " %Y"))
+                    printF("&e|  ")
+                    printF("&e|   &r&6MULTIPLE DATES:")
+                    printF("&e|   &r&5| &fThe format should be: &aMONTH DAY YEAR - MONTH DAY YEAR")
+                    printF("&e|   &r&5| &fFor example: &r&3" + now.strftime("%B") + " 1 " + now.strftime("%Y") + " - " + now.strftime("%B") + " " + str(get_last_day_of_month(now).day) + " " + now.strftime("%Y"))
+                else:
+                    printF("&6BUT HOLD ON!")
+                    printF("&e| &fIt seems a fatal error occurred while trying to grab and/or calculate the necessary information.")
+                    printF("&e| &fUnfortunately, &cthis means the program cannot continue as intended.")
+                    printF("&e| &fMost features have been disabled to prevent crashes.")
+                    printF("&e|  ")
+                    printF("&e|   &r&6SOLUTIONS:")
+                    printF("&e|   &r&5| &fEnsure you are connected to a stable internet connection.")
+                    printF("&e|   &r&5| &fCheck if the program is outdated by typing &bversion&f.")
+                    printF("&e|   &r&5|     &7&o(If outdated, consider upgrading by typing &b&oupgrade&7&o)")
+                    printF("&e|   &r&5| &fReinstall the program by typing &bupgrade force&f, which can fix a lot of issues.")
+                    printF("&e|   &r&5| &fContact the developer for any other issues by typing &bcontact&f.")
+                    printF("&e| ")
+                    printF(f"&e| &7&oDetected error: &8{str(self.assigner.fatal_error)}, see more with &b&oinspect")
+                printF(" ")
+                if self.updater.delta_version > 0: # user needs to update teehee
+                    printF("&6YOU ARE OUTDATED!")
+                    if self.updater.delta_version != -1:
+                        printF(f"&e| &eYou are {str(self.updater.delta_version)} version(s) out of date!")
+                    printF("&e| &fCheck what version you're using by typing \"&bversion&f\"")
+                    printF("&e| &fUpgrade your script automatically by typing \"&bupgrade&f\" &c&l(RECOMMENDED ASAP)")
+                    printF(" ")
+                try:
+                    printF(self.get_today_string())
+                except Exception as err:
+                    printF("&cAn error occurred: &8(get_today_string) " + str(err))
+                printF(" ")
             else:
-                printF("&6BUT HOLD ON!")
-                printF("&e| &fIt seems a fatal error occurred while trying to grab and/or calculate the necessary information.")
-                printF("&e| &fUnfortunately, &cthis means the program cannot continue as intended.")
-                printF("&e| &fMost features have been disabled to prevent crashes.")
-                printF("&e|  ")
-                printF("&e|   &r&6SOLUTIONS:")
-                printF("&e|   &r&5| &fEnsure you are connected to a stable internet connection.")
-                printF("&e|   &r&5| &fCheck if the program is outdated by typing &bversion&f.")
-                printF("&e|   &r&5|     &7&o(If outdated, consider upgrading by typing &b&oupgrade&7&o)")
-                printF("&e|   &r&5| &fReinstall the program by typing &bupgrade force&f, which can fix a lot of issues.")
-                printF("&e|   &r&5| &fContact the developer for any other issues by typing &bcontact&f.")
-                printF("&e| ")
-                printF(f"&e| &7&oDetected error: &8{str(self.assigner.fatal_error)}, see more with &b&oinspect")
-            printF(" ")
-            if self.updater.delta_version > 0: # user needs to update teehee
-                printF("&6YOU ARE OUTDATED!")
-                if self.updater.delta_version != -1:
-                    printF(f"&e| &eYou are {str(self.updater.delta_version)} version(s) out of date!")
-                printF("&e| &fCheck what version you're using by typing \"&bversion&f\"")
-                printF("&e| &fUpgrade your script automatically by typing \"&bupgrade&f\" &c&l(RECOMMENDED ASAP)")
+                printF("Successfully started new instance: &6SCHOOL DAY DETECTOR &8v" + Updater.VERSION)
                 printF(" ")
-            try:
-                printF(self.get_today_string())
-            except Exception as err:
-                printF("&cAn error occurred: &8(get_today_string) " + str(err))
-            printF(" ")
-        else:
-            printF("Successfully started new instance: &6SCHOOL DAY DETECTOR &8v" + Updater.VERSION)
-            printF(" ")
         self.ask_input()
 
+    # TAB finishes command names where python has readline (it doesn't on Windows)
+    def enable_completion(self):
+        try:
+            import readline
+        except ImportError:
+            return
+        readline.set_completer(self.commands.complete)
+        readline.set_completer_delims(" ")
+        if "libedit" in str(readline.__doc__):
+            readline.parse_and_bind("bind ^I rl_complete") # macOS
+        else:
+            readline.parse_and_bind("tab: complete")
+
     # removes the extra zero in %d strftime in datetime
     # like how it does November 01 2024
     # I don't like that so I made it left-strip it of any zeros
@@ -1306,7 +2973,7 @@ class UserInterface:
         suffix = ""
         next_day = self.assigner.get_next_school_day(now)
 
-        if as_epoch(now) > as_epoch(self.assigner.year_end) or as_epoch(now) < as_epoch(self.assigner.year_start):
+        if now.toordinal() > self.assigner.year_end.toordinal() or now.toordinal() < self.assigner.year_start.toordinal():
             raise ValueError("currently not in a school year, can't show today text")
 
         if next_day is not None: #don't show next school day if it's not a school day lol
@@ -1327,8 +2994,6 @@ class UserInterface:
             printF("&7&o" + str(msg))
         printF(" ")
 
-        self.ask_input()
-
 
     # LEGAL INPUTS:
     # Jan 17, 2024
@@ -1336,151 +3001,36 @@ class UserInterface:
     # Jan 17, 2024 - Jan 18, 2024
     # Jan 17, 2024-Jan 18, 2024
 
-    def date(self, string, date_format):
-        return datetime.strptime(string, date_format)
-
-    # searches an input string for a regex pattern
-    def search_regex(self, input_text, pattern):
-        return list(self.search_regex_complex(input_text, pattern).values())
-
-    # returns a dictionary (map) of regex position matches along with what matched
-    # for example:
-    # input = "This is a 123 test"
-    # pattern = "\d{3}" (3 digits in a row)
-    # returned: {11: "123"}
-    # the start index is the start of the string rather than the end
-    def search_regex_complex(self, input_text, pattern):
-        returned = {}
-        for item in re.compile(pattern).finditer(input_text):
-            returned[item.span()[0]] = item.group(0)
-        return returned
-
-    # check if a date can be parsed into a date format
-    def is_date(self, string, date_format):
-        try:
-            self.date(string, date_format)
-            return True
-        except ValueError:
-            return False
-
-    # returns a list of indices of where dates of a certain format are located
-    def find_dates(self, user_input, date_format, day_separators=None):
-        try:
-            returned = []
-            original_format = date_format
-            char_map = UserInterface.DATES_CHARACTER_MAP # for ease of access reasons
-            for character in char_map: # make date format in a regular expression
-                regex = char_map[character][1]
-                if day_separators is not None and "d" in character:
-                    for separator in day_separators:
-                        date_format = date_format.replace(character, regex + separator + regex)
-                date_format = date_format.replace(character, regex)
-
-            dates_raw = self.search_regex(user_input, date_format)
-
-            if len(dates_raw) == 0 and day_separators == None: # old method of Jan 1-31 2024
-                dates_raw = self.find_dates(user_input, original_format, day_separators=[separator for separator in UserInterface.SEPARATORS if separator in user_input])
-
-            if len(dates_raw) == 0:
-                return []
-
-            dates_and_separators = self.search_regex_complex(user_input, UserInterface.REGEX_SEPARATORS + "|" + date_format)
-            next_date, separator, previous_date = None, False, None
-            for index, key in enumerate(dates_and_separators):
-                match = dates_and_separators.get(key)
-                if match not in UserInterface.SEPARATORS:
-                    if next_date is None and self.is_date(match, original_format):
-                        next_date = self.date(match, original_format)
-                    elif previous_date is None and separator == True and self.is_date(match, original_format):
-                        previous_date = self.date(match, original_format)
-                        
-                        delta = (max(previous_date, next_date) - min(previous_date, next_date)).days
-                        
-                        for i in range(0, delta):
-                            dates_raw.append(next_date)
-                            next_date = next_date + timedelta(days=1)
-
-                        next_date, separator, previous_date = None, False, None
-                    continue
-
-                separator = True
-
-
-            dates = []
-            for index, date in enumerate(dates_raw):
-                if day_separators is None:
-                    try:
-                        dates.append(self.date(date, original_format) if type(date) is str else date)
-                    except ValueError as err:
-                        pass
-                    continue
-
-                for separator in day_separators:
-                    located_regex = self.search_regex(user_input, "\d{1,2}" + separator + "\d{1,2}")[0]                
-                    days = [int(i) for i in located_regex.split(separator)]
-
-                date = self.date(user_input.replace(located_regex, "1"), original_format)
-
-                month = date.month
-                year = date.year
-
-                dates = dates + [datetime(year=year, month=month, day=i) for i in range(min(days), max(days) + 1)]
-
-            return dates
-        except Exception as err:
-            return []
-
-    def finalize_and_sort_input(self, final_dates):
-        if len(final_dates) == 1:
-            return final_dates[0]
-
-        final_dates = list(set(final_dates)) # remove duplicates
-
-        dates = {}
-        for date in final_dates:
-            dates[as_epoch(date)] = date
-
-        return [dates.get(key) for key in dict(sorted(dates.items())).keys()]
-
+    # the (first, last) pairs of dates that were typed, merged and in order
     def try_input(self, user_input):
-        try:
-         #   for date_format in self.date_formats:
-           #     date = self.try_input(date, inputted, date_format.
-            dates = []
-            for date_format in UserInterface.DATE_FORMATS:
-                found = self.find_dates(user_input, date_format)
-                dates = dates + found
-
-            dates = self.finalize_and_sort_input(dates)
-
-            if isinstance(dates, list):
-                if len(dates) == 0:
-                    raise ValueError("Failed to find dates from input: '" + str(user_input) + "'")
-                if len(dates) == 1:
-                    dates = dates[0]
-
-            return dates
-        except Exception as err:
-            return err if err.__context__ is None else err.__context__
+        found = DateParser.merge(DateParser.parse(user_input))
+        if len(found) == 0:
+            return ValueError("Failed to find dates from input: '" + str(user_input) + "'")
+        return found
 
+    # asks for a date or command and answers it, over and over until the program is closed, this is a loop
+    # rather than calling itself after every answer so a window left open all year doesn't run out of stack
     def ask_input(self, forced: str=None):
-        try:
-            inputted = input(UserInterface.color_full("&fEnter date or command: &b")) if forced == None else forced
-        except KeyboardInterrupt as err:
-            raise err
-        except EOFError:
-            inputted = ""
-
+        while True:
+            try:
+                inputted = input(UserInterface.color_full("&fEnter date or command: &b")) if forced == None else forced
+            except KeyboardInterrupt as err:
+                raise err
+            except EOFError:
+                return # nothing left to read (everything that was piped in has been answered)
+            forced = None
+            self.handle_input(inputted)
+
+    # answers one line of input (a command, a date, or a range of dates)
+    def handle_input(self, inputted):
         if inputted.strip() == "":
-            self.ask_input()
             return
 
         # execute any potential commands, if the evaluate func returns "True", we know it was a real command
         if self.commands.evaluate(self, inputted.strip()):
-            self.ask_input()
             return
-            
-        if assigner.fatal_error:
+
+        if self.assigner.fatal_error:
             printF(" ")
             printF("&c&lFATAL ERROR")
             printF("&e| &fIt seems a fatal error occurred while trying to grab and/or calculate the necessary information.")
@@ -1496,78 +3046,557 @@ class UserInterface:
             printF("&e| ")
             printF(f"&e| &7&oDetected error: &8{str(self.assigner.fatal_error)}, see more with &b&oinspect")
             printF(" ")
-            self.ask_input()
             return
 
-        # remove ordinals from date input as they could be not allowed
-        # for example: January 1st, 2024 (illegal input) -> January 1, 2024 (valid input)
-        for ordinal in ["st", "nd", "rd", "th"]:
-            inputted = inputted.replace(ordinal, "")
-
-        # trying different input dates as the user may have their preference
+        # ordinals (January 1st, 2024) are fine, the parser reads "1st" as a day
         date = self.try_input(inputted)
 
-        if isinstance(date, Exception) or date == None:
+        if isinstance(date, Exception) or date == None or len(date) == 0:
             if isinstance(date, ValueError) and ("does not match format" in str(date) or "Failed to find date" in str(date)):
                 self.error("You entered an incorrect date format or command.\nTry typing \"&nhelp&r&7&o\" for help.", None)
                 return
             self.error("Standard error of type " + str(type(date)), date)
             return
 
-        printF(" ")
-        printF(" ")
         try:
-            if isinstance(date, list):
-                for item in date:
-                    self.print_information(item, True)
+            with Renderer.buffered():
                 printF(" ")
-            else:
-                self.print_information(date)
+                printF(" ")
+                total = DateParser.count(date)
+                if total == 1:
+                    self.print_information(date[0][0])
+                else:
+                    if len(date) == 1 and total > UserInterface.LONGEST_LISTED_RANGE:
+                        self.print_summary(date[0][0], date[0][1])
+                    self.print_pages(DateParser.iterate(date), total)
+                    printF(" ")
         except Exception as err:
             self.error("Standard error of type " + str(type(date)) + " during print information", date)
 
-        self.ask_input()
-
+    # the answer comes from the AnswerTable of the day's school year, only days outside of every school
+    # year are worked out here
     def provide_information(self, date, prefix=None, colored=True):
-        date_type = self.assigner.get_date_type(date)
-        day_letter = self.assigner.get_day_letter(date)
-        day_off_reason = self.assigner.get_day_off_reason(date)
+        days, offset = self.assigner.calendar_for(self.assigner.normalize(date))
+        answer = days.answers.answers[offset] if offset is not None and days.answers is not None else AnswerTable.OUT_OF_SCOPE
         
-        prefix = (("That day is " if isinstance(date, list) == False else "") if prefix == None else prefix) + ("&r" if colored==True else "")
-        
-        if not day_letter == None:
-            return prefix + (("&c" if colored==True else "") if day_letter == DayLetter.A_DAY else ("&9" if colored==True else "")) + DayLetter.format(day_letter)
-        elif not day_off_reason == None:
-            return prefix + ("&e" if colored==True else "") + day_off_reason
-        if date_type == DateType.OUT_OF_SCOPE:
-            return prefix + ("&4" if colored==True else "") + "not in this school year"
-        else:
-            return prefix + ("&2" if colored==True else "") + DateType.format(date_type)
-        raise RuntimeError("Information was not handled nor provided correctly to self.provide_information")
+        prefix = (AnswerTable.PREFIX if prefix == None else prefix) + ("&r" if colored==True else "")
+        return prefix + answer[0 if colored == True else 1]
+
+    def print_summary(self, from_date, to_date):
+        from_date, to_date = self.assigner.normalize(from_date), self.assigner.normalize(to_date)
+        summary = self.assigner.get_range_summary(from_date, to_date)
+        printF("&6&n" + from_date.strftime("%a, %b " + self.number_of(from_date) + " %Y").upper() + "&r &6-> &6&n" + to_date.strftime("%a, %b " + self.number_of(to_date) + " %Y").upper())
+        printF("&e| &f" + str(summary["calendar_days"]) + " days, &a" + str(summary["school_days"]) + " school days &f(&c" + str(summary["a_days"]) + " A days&f, &9" + str(summary["b_days"]) + " B days&f)")
+        printF("&e| &2" + str(summary["weekends"]) + " weekend days&f, &e" + str(summary["days_off"]) + " days off" + ("&f, &4" + str(summary["out_of_scope"]) + " not in any school year" if summary["out_of_scope"] > 0 else ""))
+        if summary["remaining"]["school_days"] > 0:
+            remaining = summary["remaining"]
+            printF("&e| &fStill to come: &a" + str(remaining["school_days"]) + " school days &f(&c" + str(remaining["a_days"]) + " A days&f, &9" + str(remaining["b_days"]) + " B days&f)")
+        printF(" ")
+
+    # lists the days as they come, asking before every page after the first one so the first days show
+    # up right away no matter how long the range is (only when someone is typing, piped input gets
+    # everything or whatever --limit allows)
+    def print_pages(self, dates, total):
+        shown = 0
+        for day in dates:
+            if UserInterface.LIMIT is not None and shown >= UserInterface.LIMIT:
+                printF("&7&o... and " + "{:,}".format(total - shown) + " more (stopped at --limit " + str(UserInterface.LIMIT) + ")")
+                return
+            if shown > 0 and shown % UserInterface.PAGE_SIZE == 0 and sys.stdin.isatty():
+                Renderer.flush()
+                try:
+                    answer = input(UserInterface.color_full("&7&o" + "{:,}".format(shown) + " of " + "{:,}".format(total) + " days shown, press ENTER for more (anything else stops): &b"))
+                except EOFError:
+                    answer = "stop"
+                if answer.strip() != "":
+                    return
+            self.print_information(day, True)
+            shown += 1
 
     def print_information(self, inputted_date, list_element=False):
         if not isinstance(inputted_date, list):
             inputted_date = [inputted_date] # format as list
 
-        items = []
         for date in inputted_date:
-            day = Constants.DAYS[date.weekday()].upper()
-            items.append(
-                [("&6&n" + (day[0:3] if list_element == True else day) + ", " + (Constants.MONTHS[date.month - 1].upper()[0:3] if list_element == True else Constants.MONTHS[date.month - 1].upper()) + " " + str(date.day) + self.assigner.get_ordinal_ending(date.day).upper() + ", " + str(date.year)),
-                (self.provide_information(date)),
-                 " "]
-            )
-
-        for item in items:
+            date = self.assigner.normalize(date)
+            days, offset = self.assigner.calendar_for(date)
+            table = days.answers if offset is not None else None
             if list_element == True:
-                printF("&r ".join(item))
+                printF(table.lines[offset] if table is not None else AnswerTable.line_for(date, AnswerTable.OUT_OF_SCOPE))
                 continue
-            
-            for date in item:
-                printF(date)
+
+            printF(table.headings[offset] if table is not None else AnswerTable.heading_for(date))
+            printF(self.provide_information(date))
+            printF(" ")
+
+# the update check and the RCPS website have nothing to do with each other, so instead of waiting
+# for one and then the other, both of them are started at the same time and we wait for the slowest
+# returns the updater, the assigners (one per district, by key), and how long each part took (for the "TOOK x TO START" message)
+def start_concurrently():
+    from concurrent.futures import ThreadPoolExecutor
+    phases = {}
+
+    def timed(name, constructor):
+        phase_start = datetime.now()
+        try:
+            return constructor()
+        finally:
+            phases[name] = datetime.now() - phase_start
+
+    Updater.parse_arguments()
+    districts = District.load_all()
+    # every district's website is read at the same time, so more districts don't make starting slower
+    pool = ThreadPoolExecutor(max_workers=1 + len(districts), thread_name_prefix="startup")
+    try:
+        updater_future = pool.submit(timed, "CHECK FOR UPDATES", Updater)
+        assigner_futures = OrderedDict()
+        for district in districts:
+            assigner_futures[district.key] = pool.submit(timed, "READ " + district.key.upper() + " WEBSITE", lambda district=district: ABDateAssigner(district))
+        updater = updater_future.result()
+        assigners = OrderedDict((key, future.result()) for key, future in assigner_futures.items())
+    finally:
+        # don't hang around for the other one if something went wrong (CTRL + C, no internet, etc.)
+        pool.shutdown(wait=False)
+
+    if updater.offline:
+        if assigners[District.DEFAULT_KEY].fatal_error is not None:
+            Log.text(" ")
+            Log.text(" ")
+            Log.text(" ")
+            Log.text("*************************************************************************")
+            Log.text("**            Failed to retrieve data from the internet.               **")
+            Log.text("**                Are you connected to the internet?                   **")
+            Log.text("** You must be connected to the internet in order to use this program! **")
+            Log.text("**                                                                     **")
+            Log.text("**                     (press enter to exit)                           **")
+            Log.text("*************************************************************************")
+            os.system("pause >NUL")
+            exit()
+        Log.text("No internet connection, continuing with the cached calendar (updates weren't checked)")
+
+    return updater, assigners, phases
+
+# the district asked for with --district <name>, RCPS if there wasn't one
+def requested_district():
+    if "--district" not in sys.argv or sys.argv.index("--district") + 1 >= len(sys.argv):
+        return District.rcps()
+    key = sys.argv[sys.argv.index("--district") + 1].lower()
+    for district in District.load_all():
+        if district.key == key:
+            return district
+    raise ValueError("There is no district called '" + key + "'")
+
+# turns "March 3rd 2025", "Mar 3, 2025", "03/03/2025", "2025-03-03" etc. into a date for the modes that
+# don't go through the UserInterface (--query, --jsonl)
+def parse_query_date(text):
+    found = DateParser.parse(str(text))
+    if len(found) != 1 or found[0][0] != found[0][1]:
+        raise ValueError("Failed to find a date in '" + str(text).strip() + "'")
+    return found[0][0]
+
+# --query "March 3 2025" or --today
+# answers in one line of JSON and exits without the banner, the update check, or asking for input
+# the calendar comes from the cache when there is one, so the website (and the requests module) is
+# only needed the first time and then once every FindDatesList.MAX_CACHE_AGE (--max-age <hours>)
+def answer_query():
+    Log.silent = True
+    FindDatesList.PREFER_CACHE = True
+    try:
+        district = requested_district()
+        if "--max-age" in sys.argv:
+            FindDatesList.MAX_CACHE_AGE = timedelta(hours=float(sys.argv[sys.argv.index("--max-age") + 1]))
+        if "--today" in sys.argv:
+            query_date = date.today()
+        else:
+            query_date = parse_query_date(sys.argv[sys.argv.index("--query") + 1])
+
+        # the snapshot answers without reading (or compiling) anything but the one day asked for, as long
+        # as the website was checked recently enough (otherwise it is checked below and the snapshot rewritten
+        # if the calendar changed) and the snapshot was made from the calendar that's in the cache (writing
+        # it can fail after the cache was already saved)
+        snapshot = None
+        cache = FindDatesList.read_cache(district)
+        if cache is not None and FindDatesList.is_fresh(cache):
+            try:
+                snapshot = CalendarSnapshot(get_cache_path(district.cache_name(CalendarSnapshot.FILE)))
+            except Exception as err:
+                Log.text("No usable snapshot, reading the calendar instead: " + str(err))
+            if snapshot is not None and snapshot.source_hash != cache.get("hash"):
+                Log.text("The snapshot is not from the cached calendar, reading the calendar instead")
+                snapshot.close()
+                snapshot = None
+        if snapshot is not None:
+            try:
+                information = snapshot.describe(query_date)
+            finally:
+                snapshot.close()
+            if information["type"] == DateType.value_of(DateType.OUT_OF_SCOPE):
+                # maybe a year from before (the same ones the program knows about when it's opened)
+                store = CalendarStore()
+                store.load_archives(district)
+                information = store.describe(query_date) or information
+            print(json.dumps(information), flush=True)
+            return 0
+
+        assigner = ABDateAssigner(district)
+        if assigner.fatal_error is not None:
+            raise assigner.fatal_error
+
+        print(json.dumps(assigner.describe(query_date)), flush=True)
+        return 0
+    except Exception as err:
+        print(json.dumps({"error": str(err), "type": type(err).__name__}), flush=True)
+        return 1
+
+# --jsonl
+# for programs that keep the script open instead of starting it for every question: one request per
+# line comes in (stdin) and one JSON object per line goes out (stdout), the website is only read once
+# requests look like:
+#   {"id": 1, "date": "March 3 2025"}
+#   {"id": 2, "from": "2025-03-03", "to": "2025-03-07"} (at most a year of days, "more": true if it stopped early)
+#   {"id": 3, "command": "next", "args": ["2025-03-07"]}
+# a line that isn't JSON is read as a date, and "id" (if there is one) is sent back with the answer
+# "district" picks which district answers (RCPS, or the first one given, if there isn't one)
+class JsonLines:
+    # the most days one range answers with, "limit" can ask for fewer but not more
+    MAX_RANGE = 366
+
+    def __init__(self, assigners: dict):
+        self.assigners = assigners
+        self.assigner = next(iter(assigners.values()))
+        self.write_lock = threading.Lock()
+        self.commands = {
+            "today": self.today,
+            "next": self.next_school_day,
+            "previous": self.previous_school_day,
+            "after": self.school_days_after,
+            "nth": self.nth_school_day,
+            "totals": self.totals,
+            "daysoff": self.days_off,
+            "schooldays": self.school_days,
+            "summary": self.summary,
+            "years": self.years,
+            "ping": self.ping
+        }
+
+    def handle(self, request):
+        if not isinstance(request, dict):
+            request = {"date": request}
+
+        command = str(request["command"]).lower() if "command" in request else None
+        if command is not None and command not in self.commands:
+            raise ValueError("Unknown command '" + command + "', try one of " + ", ".join(self.commands.keys()))
+
+        assigner = self.assigner_for(request.get("district"))
+        if assigner.fatal_error is not None and command != "ping":
+            raise RuntimeError("The calendar failed to load: " + str(assigner.fatal_error))
+
+        if command is not None:
+            args = request.get("args") or []
+            return self.commands[command](assigner, args if isinstance(args, list) else [args])
+
+        if "from" in request or "to" in request:
+            from_date = parse_query_date(request["from"])
+            to_date = parse_query_date(request["to"])
+            if from_date > to_date:
+                from_date, to_date = to_date, from_date
+            # "limit" answers with the first days only (and "more": true if there were more)
+            limit = JsonLines.MAX_RANGE
+            if request.get("limit") is not None:
+                limit = min(max(1, int(request["limit"])), JsonLines.MAX_RANGE)
+            days = []
+            for day in DateParser.iterate([(from_date, to_date)]):
+                if len(days) >= limit:
+                    return {"days": days, "more": True}
+                days.append(assigner.describe(day))
+            return {"days": days, "more": False}
+
+        if "date" in request:
+            return assigner.describe(parse_query_date(request["date"]))
+
+        raise ValueError("Request needs a \"date\", a \"from\" and \"to\", or a \"command\"")
+
+    def assigner_for(self, key):
+        if key is None:
+            return self.assigner
+        if str(key).lower() not in self.assigners:
+            raise ValueError("Unknown district '" + str(key) + "', try one of " + ", ".join(self.assigners.keys()))
+        return self.assigners[str(key).lower()]
+
+    def today(self, assigner, args):
+        information = assigner.describe(date.today())
+        next_day = assigner.get_next_school_day(date.today()) if information["type"] != "OUT_OF_SCOPE" else None
+        information["next_school_day"] = next_day.isoformat() if next_day is not None else None
+        return information
+
+    # "args": ["2025-03-07"] or ["A", "2025-03-07"] for the next A day
+    def next_school_day(self, assigner, args):
+        letter = None
+        if len(args) > 0 and str(args[0]).lower() in ["a", "b"]:
+            letter = DayLetter.A_DAY if str(args[0]).lower() == "a" else DayLetter.B_DAY
+            args = args[1:]
+        from_date = parse_query_date(" ".join(args)) if len(args) > 0 else date.today()
+        next_day = assigner.get_next_school_day(from_date) if letter is None else assigner.get_next_day_with_letter(from_date, letter)
+        return assigner.describe(next_day) if next_day is not None else {"date": None}
+
+    def previous_school_day(self, assigner, args):
+        from_date = parse_query_date(" ".join(args)) if len(args) > 0 else date.today()
+        previous_day = assigner.get_previous_school_day(from_date)
+        return assigner.describe(previous_day) if previous_day is not None else {"date": None}
+
+    # "args": [5, "2025-03-07"], 5 school days after March 7th (-5 for before)
+    def school_days_after(self, assigner, args):
+        if len(args) == 0:
+            raise ValueError("after needs a number of school days (and a date, today if there isn't one)")
+        from_date = parse_query_date(" ".join(str(arg) for arg in args[1:])) if len(args) > 1 else date.today()
+        day = assigner.add_school_days(from_date, int(args[0]))
+        return assigner.describe(day) if day is not None else {"date": None}
+
+    # "args": [100], the 100th school day of the year
+    def nth_school_day(self, assigner, args):
+        if len(args) != 1:
+            raise ValueError("nth needs which school day it is")
+        day = assigner.get_nth_school_day(int(args[0]))
+        return assigner.describe(day) if day is not None else {"date": None}
+
+    def totals(self, assigner, args):
+        calendar_days, school_days = assigner.get_total_days()
+        return {
+            "year_start": assigner.year_start.isoformat(),
+            "year_end": assigner.year_end.isoformat(),
+            "calendar_days": calendar_days,
+            "school_days": school_days,
+            "days_off": len(assigner.get_days_off())
+        }
+
+    def days_off(self, assigner, args):
+        return {"days_off": {day.isoformat(): reason for day, reason in assigner.get_days_off().items()}}
+
+    # "args": ["September 1 2023", "June 1 2025"]
+    def school_days(self, assigner, args):
+        if len(args) != 2:
+            raise ValueError("schooldays needs a from date and a to date")
+        from_date, to_date = parse_query_date(args[0]), parse_query_date(args[1])
+        return {"from": from_date.isoformat(), "to": to_date.isoformat(), "school_days": assigner.count_school_days(from_date, to_date)}
+
+    # "args": ["2025-01-01", "2025-06-01"], how many school/A/B days, weekends, days off (and still to come)
+    def summary(self, assigner, args):
+        if len(args) != 2:
+            raise ValueError("summary needs a from date and a to date")
+        return assigner.get_range_summary(parse_query_date(args[0]), parse_query_date(args[1]))
+
+    def years(self, assigner, args):
+        return {"years": [{"year_start": start.isoformat(), "year_end": end.isoformat()} for start, end in assigner.get_school_years()]}
+
+    def ping(self, assigner, args):
+        return {"ok": True, "version": Updater.VERSION}
+
+    def answer(self, line):
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = line
+            if isinstance(request, dict):
+                request_id = request.get("id")
+            response = self.handle(request)
+        except Exception as err:
+            response = {"error": str(err), "type": type(err).__name__}
+        if request_id is not None:
+            response = {"id": request_id, **response}
+        return json.dumps(response)
+
+    def run(self, stream_in, stream_out):
+        for line in iter(stream_in.readline, ""):
+            line = line.strip()
+            if line == "":
+                continue
+            with self.write_lock:
+                stream_out.write(self.answer(line) + "\n")
+                stream_out.flush()
+
+    # with --watch, calendar changes are sent as they happen: {"event": "calendar_changed", ...}
+    def send_event(self, stream_out, event, data):
+        with self.write_lock:
+            stream_out.write(json.dumps({"event": event, **data}) + "\n")
+            stream_out.flush()
+
+def run_json_lines():
+    Log.silent = True
+    Updater.parse_arguments()
+    protocol = JsonLines(read_districts())
+    minutes = CalendarWatcher.requested_minutes()
+    if minutes is not None:
+        watcher = CalendarWatcher(protocol.assigners, minutes)
+        watcher.listeners.append(lambda diff: protocol.send_event(sys.stdout, "calendar_changed", diff))
+        watcher.start()
+    protocol.run(sys.stdin, sys.stdout)
+    return 0
+
+# every district's calendar for --jsonl and --serve, by key, read at the same time
+def read_districts():
+    from concurrent.futures import ThreadPoolExecutor
+    districts = District.load_all()
+    with ThreadPoolExecutor(max_workers=len(districts), thread_name_prefix="districts") as pool:
+        futures = OrderedDict((district.key, pool.submit(ABDateAssigner, district)) for district in districts)
+        return OrderedDict((key, future.result()) for key, future in futures.items())
+
+# --serve [port]
+# builds the calendar once and answers everyone on this computer over HTTP (kiosks, scripts, etc.) so
+# they don't all have to read the RCPS website and compile the year themselves, answers are JSON
+#   GET  /date?d=March 3 2025          -> one day
+#   GET  /range?from=...&to=...        -> every day in between (both included, a year at most, &limit=N for the first N)
+#   GET  /summary?from=...&to=...      -> how many school/A/B days, weekends, days off are in between
+#   GET  /totals                       -> the year (start, end, calendar/school/A/B days, today's progress)
+#   GET  /daysoff                      -> every day off and why
+#   GET  /changes                      -> what changed in the calendars since starting (with --watch)
+#   POST /dates  ["2025-03-03", ...]   -> many days at once (anything --jsonl understands works too)
+# add &district=<name> (or "district" in the JSON) to ask about a district other than RCPS
+class QueryServer:
+    DEFAULT_PORT = 8036
+    MAX_BODY = 1024 * 1024 # bytes
+
+    def __init__(self, assigners: dict, watcher: "CalendarWatcher"=None):
+        self.protocol = JsonLines(assigners)
+        self.watcher = watcher
+
+    def totals(self, assigner):
+        if assigner.fatal_error is not None:
+            raise RuntimeError("The calendar failed to load: " + str(assigner.fatal_error))
+        totals = self.protocol.totals(assigner, [])
+        summary = assigner.days.get_summary()
+        totals["a_days"] = summary["school_days"]["A_DAY"]
+        totals["b_days"] = summary["school_days"]["B_DAY"]
+        today = assigner.describe(date.today())
+        totals["today"] = today
+        return totals
+
+    # returns (HTTP status, JSON-able answer)
+    def answer_get(self, path, query):
+        def parameter(name):
+            if name not in query:
+                raise ValueError("Missing the \"" + name + "\" parameter")
+            return query[name][0]
+
+        district = query["district"][0] if "district" in query else None
+        if path == "/date":
+            return 200, self.protocol.handle({"date": parameter("d"), "district": district})
+        if path == "/range":
+            return 200, self.protocol.handle({"from": parameter("from"), "to": parameter("to"), "limit": query["limit"][0] if "limit" in query else None, "district": district})
+        if path == "/summary":
+            return 200, self.protocol.handle({"command": "summary", "args": [parameter("from"), parameter("to")], "district": district})
+        if path == "/totals":
+            return 200, self.totals(self.protocol.assigner_for(district))
+        if path == "/daysoff":
+            return 200, self.protocol.handle({"command": "daysoff", "district": district})
+        if path == "/ping":
+            return 200, self.protocol.ping(None, [])
+        if path == "/changes":
+            return 200, {"watching": self.watcher is not None, "changes": self.watcher.history if self.watcher is not None else []}
+        return 404, {"error": "Unknown path " + path}
+
+    def answer_post(self, path, body):
+        if path != "/dates":
+            return 404, {"error": "Unknown path " + path}
+        dates = json.loads(body)
+        if isinstance(dates, dict):
+            dates = dates.get("dates", [])
+        if not isinstance(dates, list):
+            raise ValueError("Expected a list of dates")
+        answers = []
+        for request in dates:
+            try:
+                answers.append(self.protocol.handle(request))
+            except Exception as err:
+                answers.append({"error": str(err), "type": type(err).__name__})
+        return 200, {"days": answers}
+
+    def serve(self, host, port):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+        from urllib.parse import urlsplit, parse_qs
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self, status, answer):
+                body = json.dumps(answer).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                try:
+                    self.respond(*server.answer_get(url.path.rstrip("/") or "/", parse_qs(url.query)))
+                except Exception as err:
+                    self.respond(400, {"error": str(err), "type": type(err).__name__})
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                try:
+                    length = self.headers.get("Content-Length")
+                    if length is None or not length.strip().isdigit():
+                        self.respond(400, {"error": "Content-Length is missing or isn't a number of bytes"})
+                        return
+                    length = int(length)
+                    if length > QueryServer.MAX_BODY:
+                        self.respond(413, {"error": "Request is too big"})
+                        return
+                    self.respond(*server.answer_post(url.path.rstrip("/"), self.rfile.read(length)))
+                except Exception as err:
+                    self.respond(400, {"error": str(err), "type": type(err).__name__})
+
+            def log_message(self, format, *args):
+                pass # thousands of requests would bury the start-up logs
+
+        httpd = ThreadingHTTPServer((host, port), Handler)
+        httpd.daemon_threads = True
+        return httpd
+
+def run_server():
+    Updater.parse_arguments()
+    port = QueryServer.DEFAULT_PORT
+    index = sys.argv.index("--serve")
+    if len(sys.argv) > index + 1 and sys.argv[index + 1].isdigit():
+        port = int(sys.argv[index + 1])
+
+    assigners = read_districts()
+    if assigners[District.DEFAULT_KEY].fatal_error is not None:
+        printF("&cFailed to read the calendar, not starting the server: &8" + str(assigners[District.DEFAULT_KEY].fatal_error))
+        return 1
+    for key, assigner in assigners.items():
+        if assigner.fatal_error is not None:
+            printF("&eThe &b" + key + "&e calendar failed to load, asking about it will answer with an error: &8" + str(assigner.fatal_error))
+
+    watcher = None
+    minutes = CalendarWatcher.requested_minutes()
+    if minutes is not None:
+        watcher = CalendarWatcher(assigners, minutes).start()
+
+    # only this computer can ask, nobody else on the network
+    httpd = QueryServer(assigners, watcher).serve("127.0.0.1", port)
+    printF("&aAnswering on &bhttp://127.0.0.1:" + str(port) + "/ &7&o(CTRL + C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        printF("&cStopped the server.")
+    finally:
+        httpd.server_close()
+    return 0
 
 # program start
 if __name__ == "__main__":
+    if "--query" in sys.argv or "--today" in sys.argv:
+        sys.exit(answer_query())
+    if "--jsonl" in sys.argv:
+        sys.exit(run_json_lines())
+    if "--serve" in sys.argv:
+        sys.exit(run_server())
+
     using_windows = "Windows" in platform.system()
     if not using_windows:
         print("** This program recommends Windows to run. **")
@@ -1592,9 +3621,11 @@ if __name__ == "__main__":
         cmd(f"title School Day Detector - Booting Program...")
 
         Log.text("Still in __name__ (" + str(__name__) + "), instantiating valued classes...")
-        updater = Updater()
-        assigner = ABDateAssigner()
+        updater, assigners, phases = start_concurrently()
+        assigner = assigners[District.DEFAULT_KEY]
+        commands_start = datetime.now()
         commands = Commands()
+        phases["REGISTER COMMANDS"] = datetime.now() - commands_start
 
         cmd(f"title School Day Detector v{Updater.VERSION}")
         
@@ -1604,10 +3635,19 @@ if __name__ == "__main__":
         Log.text("| -> LET'S GO HOKIES!") # VT!!!!!!!!
         Log.text("| -> CREATED IN JAN 2024") # modified in the following months
         Log.text(f"| -> TOOK {str(datetime.now() - start)} TO START")
+        for phase in phases:
+            Log.text(f"|    -> {phase}: {str(phases[phase])}")
 
         Log.text("Instantiating UserInterface...")
 
-        ui = UserInterface(assigner, commands, updater)
+        watcher = None
+        minutes = CalendarWatcher.requested_minutes()
+        if minutes is not None:
+            watcher = CalendarWatcher(assigners, minutes)
+            watcher.listeners.append(UserInterface.calendar_changed)
+            watcher.start()
+
+        ui = UserInterface(assigner, commands, updater, assigners, watcher)
     except KeyboardInterrupt as err:
         try:
             print(" ")